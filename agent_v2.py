@@ -6,10 +6,11 @@ for managing and processing Python files in a repository for code quality improv
 import argparse
 import logging
 import os
+import re
 import sys
 import time
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import git
 
@@ -85,8 +86,25 @@ class AgentComponents:
 class Agent:
     """Manages the processing of Python files for code quality improvements."""
 
-    def __init__(self, config_path: Path):
+    # Vendored, virtualenv and generated protobuf files are never worth processing
+    SKIP_PATTERNS = re.compile(
+        r"(^|/)(venv|\.venv|\.tox|node_modules|site-packages)(/|$)|_pb2\.py$"
+    )
+
+    @classmethod
+    def is_vendored(cls, file: Path, repo_root: Path) -> bool:
+        """Check file against SKIP_PATTERNS using its path relative to repo_root."""
+        # Resolve both sides so a symlinked REPO_PATH still compares equal
+        try:
+            file = file.resolve().relative_to(repo_root.resolve())
+        except ValueError:
+            pass
+        return bool(cls.SKIP_PATTERNS.search(file.as_posix()))
+
+    def __init__(self, config_path: Path, sleeper=time.sleep):
         self.config = Config(config_path)
+        # Used for every pause so callers such as tests can skip the waits
+        self._sleeper = sleeper
         self.logger = Logger()
         self.components = AgentComponents(self.config, self.logger)
         self.file_processor = self.components.file_processor
@@ -108,10 +126,11 @@ class Agent:
         return self.components.git_manager.is_git_repo(self.config.repo_path)
 
     def get_tracked_files(self) -> List[str]:
-        """Retrieve a list of tracked files in the repository."""
+        """Retrieve a list of tracked Python files in the repository."""
         repo = git.Repo(self.config.repo_path)
-        tracked_files = repo.git.ls_files().splitlines()
-        return [os.path.join(repo.working_dir, file) for file in tracked_files]
+        # Let git filter by pathspec instead of listing every tracked file
+        tracked_files = repo.git.ls_files('-z', '--', '*.py').split('\0')
+        return [os.path.join(repo.working_dir, file) for file in tracked_files if file]
 
     def display_config_summary(self):
         """Display a summary of the current configuration settings."""
@@ -142,7 +161,7 @@ class Agent:
             print("You have 10 seconds to exit if you want to end the run.")
             print("Press Ctrl+C to exit.")
             try:
-                time.sleep(10)
+                self._sleeper(10)
             except KeyboardInterrupt:
                 print("\nExiting as per user request.")
                 sys.exit(0)
@@ -159,7 +178,7 @@ class Agent:
         print("\nYou have 10 seconds to review the configuration.")
         print("Press Ctrl+C to exit if you disagree with the configuration.")
         try:
-            time.sleep(10)
+            self._sleeper(10)
         except KeyboardInterrupt:
             print("\nExiting as per user request.")
             sys.exit(0)
@@ -176,13 +195,14 @@ class Agent:
                 "is not a git repository or is not the top-level directory.")
             sys.exit(1)
 
+        # Resolve before chdir, since REPO_PATH may be relative to the cwd
+        repo_root = Path(self.config.repo_path).resolve()
         os.chdir(self.config.repo_path)
 
         if filename:
             python_files = [Path(filename)]
         else:
-            tracked_files = self.get_tracked_files()
-            python_files = [Path(file) for file in tracked_files if str(file).endswith('.py')]
+            python_files = [Path(file) for file in self.get_tracked_files()]
 
         excluded_dirs = {getattr(self.config, 'venv_dir', ''), ".git", "benchmark", "tests"}
         python_files = [
@@ -190,40 +210,61 @@ class Agent:
             if not any(excluded_dir in file.parts for excluded_dir in excluded_dirs)
         ]
         for file in python_files:
-            if file.name.startswith("test_"):
-                self.logger.info(f"Skipping test file: {file}")
-                continue
-            if "__" in file.name:
-                self.logger.info(f"Skipping __<file>: {file}")
-                continue
-            line_count = self.rawgencount(file)
-            line_count_max = getattr(self.config, 'line_count_max', float('inf'))
-            if line_count > line_count_max:
-                self.logger.info(
-                    f"Skipping file with more than {line_count_max} "
-                    f"lines: {file}"
-                )
-                time.sleep(.25)
-                continue
-            if line_count == 0:
-                self.logger.info(f"Skipping empty file: {file}")
+            reason = self._skip_reason(file, repo_root)
+            if reason:
+                self.logger.info(f"Skipping {reason}: {file}")
                 continue
-            line_count_min = getattr(self.config, 'line_count_min', 0)
-            if line_count < line_count_min:
-                self.logger.info(
-                    f"Skipping file with less than {line_count_min} "
-                    f"lines: {file}"
-                )
-                continue
-
             self.logger.info(f"Attempting to process Python file: {file}")
             self.file_processor.process_file(file)
 
+    def _skip_reason(self, file: Path, repo_root: Path) -> Optional[str]:
+        """Return why file should be skipped, or None to process it."""
+        if file.name.startswith("test_"):
+            reason = "test file"
+        elif "__" in file.name:
+            reason = "__<file>"
+        elif self.is_vendored(file, repo_root):
+            reason = "vendored or generated file"
+        elif self.exceeds_max_file_bytes(file):
+            reason = f"file larger than {self.config.max_file_bytes} bytes"
+        else:
+            reason = self._line_count_skip_reason(file)
+        return reason
+
+    def _line_count_skip_reason(self, file: Path) -> Optional[str]:
+        """Return why file's line count rules it out, or None if it is in range."""
+        line_count = self.rawgencount(file)
+        line_count_max = getattr(self.config, 'line_count_max', float('inf'))
+        line_count_min = getattr(self.config, 'line_count_min', 0)
+        if line_count > line_count_max:
+            self._sleeper(.25)
+            return f"file with more than {line_count_max} lines"
+        if line_count == 0:
+            return "empty file"
+        if line_count < line_count_min:
+            return f"file with less than {line_count_min} lines"
+        return None
+
+    def exceeds_max_file_bytes(self, file: Path) -> bool:
+        """Check the file size before reading it, so huge files are never scanned."""
+        try:
+            return file.stat().st_size > self.config.max_file_bytes
+        except OSError:
+            # Leave missing or unreadable files to the line counter
+            return False
+
     @staticmethod
     def rawgencount(filename):
-        """Count the number of lines in a file using a generator."""
-        with open(filename, 'r', encoding='utf-8') as f:
-            return sum(1 for _ in f)
+        """Count the number of lines in a file by scanning raw byte chunks."""
+        count = 0
+        chunk = b''
+        with open(filename, 'rb') as f:
+            for chunk in Agent._make_gen(f.raw.read):
+                count += chunk.count(b'\n')
+        # A final line without a trailing newline still counts as a line
+        if chunk and not chunk.endswith(b'\n'):
+            count += 1
+        return count
 
     @staticmethod
     def _make_gen(reader):
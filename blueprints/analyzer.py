@@ -1,6 +1,7 @@
 import os
 import html
-from flask import Blueprint, render_template, request, jsonify
+import threading
+from flask import Blueprint, render_template, request, jsonify, current_app
 from config import Config
 from aider_interrogator import Agent
 from validators import validate_input, detect_language
@@ -38,6 +39,22 @@ def get_config():
     except Exception as e:
         raise ValueError(f"Missing required configuration: {str(e)}")
 
+_agent_lock = threading.Lock()
+
+def get_agent():
+    """Get the app's Agent, rebuilding it only when the config file changes."""
+    config_path = get_config_path()
+    try:
+        key = (config_path, os.path.getmtime(config_path))
+    except OSError:
+        key = (config_path, None)
+    with _agent_lock:
+        cached = current_app.extensions.get('analyzer_agent')
+        if cached is None or cached[0] != key:
+            cached = (key, Agent(get_config()))
+            current_app.extensions['analyzer_agent'] = cached
+    return cached[1]
+
 def handle_analyzer_error(e):
     """Handle errors that occur during code analysis."""
     error_message = str(e) or "An unexpected error occurred"
@@ -78,21 +95,21 @@ def analyze():
                 question = data.get('question', '')
                 language = data.get('language')
                 
-                # Validate input
-                is_valid, error_message = validate_input(code, question, language)
-                
-                # If no language provided, try to detect it
+                # If no language provided, try to detect it; validate_input
+                # would otherwise repeat the detection on the same code
                 if not language:
                     language = detect_language(code)
                 
+                # Validate input
+                is_valid, error_message = validate_input(code, question, language)
+                
                 # Append language context to question if detected
                 if language:
                     question = f"{question} (We believe this code is written in {language})"
                 if not is_valid:
                     return jsonify({'error': error_message}), 400
                 
-                config = get_config()
-                agent = Agent(config)
+                agent = get_agent()
                 
                 response = agent.interrogate_code(code, question)
                 return jsonify({'response': response})
@@ -101,21 +118,21 @@ def analyze():
                 language = request.form.get('language')
                 question = "As the worlds greatest developer what reliability concerns do you see in the code provided? Do not provide any code in your response"
                 
-                # Validate input
-                is_valid, error_message = validate_input(code, question, language)
-                
-                # If no language provided, try to detect it
+                # If no language provided, try to detect it; validate_input
+                # would otherwise repeat the detection on the same code
                 if not language:
                     language = detect_language(code)
                 
+                # Validate input
+                is_valid, error_message = validate_input(code, question, language)
+                
                 # Append language context to question if detected
                 if language:
                     question = f"{question} (We believe this code is written in {language})"
                 if not is_valid:
                     return render_template('error.html', error=error_message), 400
                 
-                config = Config(get_config_path())
-                agent = Agent(config)
+                agent = get_agent()
                 
                 response = agent.interrogate_code(code, question)
                 safe_response = html.escape(response)
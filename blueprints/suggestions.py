@@ -1,28 +1,42 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for
-import requests
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, current_app
 from datetime import datetime
+from functools import lru_cache
+from suggestion_db import SuggestionDB
 
 suggestions = Blueprint('suggestions', __name__)
 
+@suggestions.record_once
+def init_suggestion_db(state):
+    """Open the suggestion database once, when the blueprint is registered."""
+    state.app.extensions.setdefault('suggestion_db', SuggestionDB())
+
+def get_suggestion_db() -> SuggestionDB:
+    return current_app.extensions['suggestion_db']
+
+@lru_cache(maxsize=1024)
+def _fmt_ts(timestamp: int) -> str:
+    """Format a stored nanosecond timestamp for display; repeated views hit the cache."""
+    return datetime.fromtimestamp(timestamp / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+
 @suggestions.route('/suggestions')
 def list_suggestions():
     """Route for viewing previous suggestions"""
-    response = requests.get("http://localhost:8000/suggestions/")
-    suggestions = response.json() if response.status_code == 200 else []
+    # The page has no paging controls, so list every suggestion
+    suggestions = get_suggestion_db().get_suggestion_summaries(limit=None)
+    for suggestion in suggestions:
+        suggestion['timestamp'] = _fmt_ts(suggestion['timestamp'])
     return render_template('suggestions.html', suggestions=suggestions)
 
 @suggestions.route('/suggestion/<int:suggestion_id>')
 def suggestion_detail(suggestion_id):
-    response = requests.get(f"http://localhost:8000/suggestions/{suggestion_id}")
-    suggestion = response.json() if response.status_code == 200 else None
+    suggestion = get_suggestion_db().get_suggestion(suggestion_id)
     if suggestion:
-        suggestion['timestamp'] = datetime.fromisoformat(suggestion['timestamp']).strftime('%Y-%m-%-d %H:%M:%S')
+        suggestion['timestamp'] = _fmt_ts(suggestion['timestamp'])
     return render_template('suggestion_detail.html', suggestion=suggestion)
 
 @suggestions.route('/suggestion/<int:suggestion_id>/delete', methods=['POST'])
 def delete_suggestion(suggestion_id):
-    response = requests.post(f"http://localhost:8000/suggestions/{suggestion_id}/confirm_delete")
-    if response.status_code == 200:
+    if get_suggestion_db().delete_suggestion(suggestion_id):
         return redirect(url_for('suggestions.list_suggestions'))
     else:
         return jsonify({"error": "Failed to delete suggestion"}), 500
@@ -3,6 +3,9 @@ import yaml
 from pathlib import Path
 from config_schema import ConfigSchema
 
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class Config:
     """Configuration management class with schema validation and resource limits."""
     
@@ -10,7 +13,7 @@ class Config:
         """Initialize configuration with schema validation."""
         try:
             with open(config_path, 'r') as config_file:
-                config = yaml.safe_load(config_file)
+                config = yaml.load(config_file, Loader=_YAML_LOADER)
         except FileNotFoundError:
             config = {}
         except yaml.YAMLError as e:
@@ -18,7 +21,18 @@ class Config:
             
         if not isinstance(config, dict):
             raise ValueError(f"Invalid configuration format in {config_path}. Expected a YAML dictionary.")
-            
+
+        self._load(config)
+
+    @classmethod
+    def from_dict(cls, config: dict) -> 'Config':
+        """Build a configuration from already-parsed data, skipping the YAML file."""
+        instance = cls.__new__(cls)
+        instance._load(dict(config))
+        return instance
+
+    def _load(self, config: dict) -> None:
+        """Validate parsed configuration data and set it as attributes."""
         if not config:
             raise ValueError("Missing required configuration")
             
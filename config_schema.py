@@ -36,6 +36,7 @@ class ConfigSchema:
     api_rate_limit: int = 60  # requests per minute
     cleanup_threshold_mb: int = 400
     log_dir: str = 'logs'
+    max_file_bytes: int = 1048576  # skip larger files when scanning a repo
     
     @classmethod
     def validate(cls, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -65,7 +66,8 @@ class ConfigSchema:
             ('DB_CONNECTION_RETRIES', int, 3),
             ('API_RATE_LIMIT', int, 60),
             ('CLEANUP_THRESHOLD_MB', int, 400),
-            ('LOG_DIR', str, 'logs')
+            ('LOG_DIR', str, 'logs'),
+            ('MAX_FILE_BYTES', int, 1048576)
         ]
         
         for field_name, field_type, default_value in required_fields:
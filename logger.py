@@ -1,63 +1,168 @@
 """This module provides a custom Logger class for consistent logging across the application."""
 
+import atexit
 import logging
 import logging.handlers
+import os
+import queue
+import re
+import threading
 import time
 from pathlib import Path
 
+# The log format never prints thread/process details, so skip collecting them
+# for every LogRecord. Caller lookup stays on because the format uses
+# %(filename)s and %(lineno)d.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Matches the active log file and its numbered rotations (app.log, app.log.1, ...)
+_LOG_FILE_RE = re.compile(r".*\.log(\.\d+)?$")
+
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] %(message)s'
+)
+
+# Guards the one-time queue/listener setup shared by every Logger
+_setup_lock = threading.Lock()
+
 
 class Logger:
     """A custom logger class that provides consistent logging functionality."""
 
+    # Every Logger configures the same logging.Logger, so the queue and its
+    # listener thread are set up by the first one and shared afterwards
+    _listener = None
+    _queue_handler = None
+    _file_handlers = {}
+
     def __init__(self, log_dir=None, max_bytes=10485760, backup_count=5):
         """Initialize the Logger with a configured logging.Logger instance."""
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
-        
-        # Clear any existing handlers
-        self.logger.handlers = []
-        
-        # Always add stream handler
+        self._file_handler = None
+
+        with _setup_lock:
+            if Logger._listener is None:
+                Logger._start()
+            if log_dir:
+                self._file_handler = Logger._add_file_handler(
+                    Path(log_dir), max_bytes, backup_count
+                )
+
+    @staticmethod
+    def _start() -> None:
+        """Attach the QueueHandler and start the listener; caller holds _setup_lock."""
+        logger = logging.getLogger(__name__)
+        logger.handlers = []
+
         stream_handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] %(message)s'
+        stream_handler.setFormatter(_FORMATTER)
+
+        # Callers only enqueue records and the handlers' I/O runs on the
+        # listener thread; QueueHandler.prepare() still formats each message
+        # in the caller's thread
+        log_queue = queue.Queue(-1)
+        Logger._queue_handler = logging.handlers.QueueHandler(log_queue)
+        logger.addHandler(Logger._queue_handler)
+        Logger._listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, respect_handler_level=True
         )
-        stream_handler.setFormatter(formatter)
-        self.logger.addHandler(stream_handler)
-        
-        # Add file handler if log_dir is specified
-        if log_dir:
-            log_dir = Path(log_dir)
-            try:
-                log_dir.mkdir(exist_ok=True, parents=True)
-            except Exception as e:
-                print(f"Warning: Could not create log directory {log_dir}: {e}")
+        Logger._listener.start()
+
+    @staticmethod
+    def _add_file_handler(log_dir: Path, max_bytes: int, backup_count: int):
+        """Add a rotating file handler for log_dir unless one is already attached."""
+        key = log_dir.resolve()
+        if key in Logger._file_handlers:
+            return None
+        try:
+            log_dir.mkdir(exist_ok=True, parents=True)
+        except Exception as e:
+            print(f"Warning: Could not create log directory {log_dir}: {e}")
+            return None
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_dir / 'app.log',
+            maxBytes=max_bytes,
+            backupCount=backup_count
+        )
+        file_handler.setFormatter(_FORMATTER)
+        Logger._file_handlers[key] = file_handler
+        # The listener thread reads this tuple per record, so swap it whole
+        Logger._listener.handlers = Logger._listener.handlers + (file_handler,)
+        return file_handler
+
+    @property
+    def handlers(self):
+        """Return the handlers that actually write the log output."""
+        listener = Logger._listener
+        return list(listener.handlers) if listener else []
+
+    @staticmethod
+    def flush() -> None:
+        """Wait until every record queued so far has been handled."""
+        with _setup_lock:
+            listener = Logger._listener
+            if listener is None:
                 return
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_dir / 'app.log',
-                maxBytes=max_bytes,
-                backupCount=backup_count
-            )
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-
-    def info(self, message: str) -> None:
+            # stop() drains the queue; records logged meanwhile stay queued
+            # for the restarted thread
+            listener.stop()
+            listener.start()
+
+    def close(self) -> None:
+        """Flush, then detach and close the file handler this Logger added."""
+        file_handler, self._file_handler = self._file_handler, None
+        if file_handler is None:
+            return
+        Logger.flush()
+        with _setup_lock:
+            listener = Logger._listener
+            if listener is not None:
+                listener.handlers = tuple(h for h in listener.handlers if h is not file_handler)
+            for key, handler in list(Logger._file_handlers.items()):
+                if handler is file_handler:
+                    del Logger._file_handlers[key]
+        file_handler.close()
+
+    @staticmethod
+    def shutdown() -> None:
+        """Flush queued records and close the output handlers."""
+        with _setup_lock:
+            listener = Logger._listener
+            if listener is None:
+                return
+            # Detach first so nothing keeps filling a queue no thread reads
+            logging.getLogger(__name__).removeHandler(Logger._queue_handler)
+            Logger._listener = None
+            Logger._queue_handler = None
+            Logger._file_handlers = {}
+            listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+    def info(self, message: str, *args) -> None:
         """
         Log an info level message.
 
         Args:
             message (str): The message to be logged.
+            *args: Values for %-style placeholders in message, only
+                formatted if the record is actually emitted.
         """
-        self.logger.info(message)
+        self.logger.info(message, *args)
 
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args) -> None:
         """
         Log an error level message.
 
         Args:
             message (str): The error message to be logged.
+            *args: Values for %-style placeholders in message, only
+                formatted if the record is actually emitted.
         """
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
     @staticmethod
     def cleanup_old_logs(log_dir: str, max_age_days: int = 30) -> None:
@@ -68,14 +173,20 @@ class Logger:
             log_dir (str): Directory containing log files
             max_age_days (int): Maximum age of log files in days
         """
-        log_path = Path(log_dir)
-        if not log_path.exists():
+        if not os.path.isdir(log_dir):
             return
             
         current_time = time.time()
         max_age_seconds = max_age_days * 24 * 3600
         
-        for log_file in log_path.glob("*.log*"):
-            file_age = current_time - log_file.stat().st_mtime
-            if file_age > max_age_seconds:
-                log_file.unlink()
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if not _LOG_FILE_RE.match(entry.name):
+                    continue
+                if current_time - entry.stat().st_mtime > max_age_seconds:
+                    os.unlink(entry.path)
+
+
+atexit.register(Logger.shutdown)
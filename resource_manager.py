@@ -2,12 +2,26 @@
 import psutil
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
-from datetime import datetime, timedelta
+
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+TEMP_FILE_MAX_AGE_SECONDS = 3600
+# Expired temp files are unlinked on a small thread pool past this count
+PARALLEL_UNLINK_THRESHOLD = 32
+UNLINK_WORKERS = 4
 
 class ResourceManager:
     """Manages system resources and enforces limits."""
+
+    # A single scheduler thread monitors every registered manager, so the
+    # number of wakeups per second stays at one regardless of instance count
+    MONITOR_INTERVAL_SECONDS = 1
+    _registry = weakref.WeakSet()
+    _scheduler = None
+    _lock = threading.Lock()
     
     def __init__(self, config):
         self.config = config
@@ -16,76 +30,122 @@ class ResourceManager:
         self.temp_files = set()
         self.api_calls = []
         self.monitoring = False
-        self.monitor_thread = None
         
     def start_monitoring(self):
-        """Start the resource monitoring thread."""
+        """Register with the shared monitoring thread, starting it if needed."""
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_resources)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        with ResourceManager._lock:
+            ResourceManager._registry.add(self)
+            if ResourceManager._scheduler is None:
+                ResourceManager._scheduler = threading.Thread(
+                    target=ResourceManager._run_scheduler, daemon=True
+                )
+                ResourceManager._scheduler.start()
         
     def stop_monitoring(self):
-        """Stop the resource monitoring thread."""
+        """Unregister from the shared monitoring thread."""
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join()
+        with ResourceManager._lock:
+            ResourceManager._registry.discard(self)
+
+    @classmethod
+    def _run_scheduler(cls):
+        """Tick every registered manager until none are left."""
+        while cls._tick():
+            time.sleep(cls.MONITOR_INTERVAL_SECONDS)
+
+    @classmethod
+    def _tick(cls) -> bool:
+        """Monitor each registered manager once; False once the registry is empty.
+
+        The strong references taken here end with the call, so managers
+        dropped elsewhere can be collected while the scheduler sleeps.
+        """
+        with cls._lock:
+            managers = list(cls._registry)
+            if not managers:
+                cls._scheduler = None
+                return False
+        for manager in managers:
+            manager._monitor_resources()
+        return True
             
     def _monitor_resources(self):
-        """Monitor system resources in a separate thread."""
-        while self.monitoring:
-            try:
-                memory_percent = self.process.memory_percent()
-                cpu_percent = self.process.cpu_percent()
+        """Check resource usage once; called from the shared scheduler thread."""
+        if not self.monitoring:
+            return
+        try:
+            memory_percent = self.process.memory_percent()
+            cpu_percent = self.process.cpu_percent()
+            
+            # Only warn if memory usage exceeds 80% of max_memory_mb
+            max_memory_percent = (self.process.memory_info().rss / (self.config.max_memory_mb * 1024 * 1024)) * 100
+            if max_memory_percent > 80:
+                self.logger.warning("Memory usage too high: %.1f%%", memory_percent)
+                self.cleanup_resources()
                 
-                # Only warn if memory usage exceeds 80% of max_memory_mb
-                max_memory_percent = (self.process.memory_info().rss / (self.config.max_memory_mb * 1024 * 1024)) * 100
-                if max_memory_percent > 80:
-                    self.logger.warning(f"Memory usage too high: {memory_percent:.1f}%")
-                    self.cleanup_resources()
-                    
-                if cpu_percent > self.config.max_cpu_percent:
-                    self.logger.warning(f"CPU usage too high: {cpu_percent:.1f}%")
-                    
-            except Exception as e:
-                self.logger.error(f"Error monitoring resources: {e}")
+            if cpu_percent > self.config.max_cpu_percent:
+                self.logger.warning("CPU usage too high: %.1f%%", cpu_percent)
                 
-            time.sleep(1)
+        except Exception as e:
+            self.logger.error("Error monitoring resources: %s", e)
             
     def cleanup_resources(self):
         """Clean up temporary files and other resources."""
-        current_time = datetime.now()
+        current_time = time.time()
         
-        # Clean up old temporary files
-        for temp_file in list(self.temp_files):
+        # Partition the temp files in one pass; files registered while this
+        # runs land in the fresh set and are merged back at the end
+        temp_files, self.temp_files = self.temp_files, set()
+        keep = set()
+        expired = []
+        for temp_file in temp_files:
             try:
-                if not temp_file.exists():
-                    self.temp_files.remove(temp_file)
-                    continue
-                    
                 # Remove files older than 1 hour
-                if current_time - datetime.fromtimestamp(temp_file.stat().st_mtime) > timedelta(hours=1):
-                    temp_file.unlink()
-                    self.temp_files.remove(temp_file)
-            except Exception as e:
+                if current_time - temp_file.stat().st_mtime > TEMP_FILE_MAX_AGE_SECONDS:
+                    expired.append(temp_file)
+                else:
+                    keep.add(temp_file)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
                 self.logger.error(f"Error cleaning up temp file {temp_file}: {e}")
+                keep.add(temp_file)
+
+        if len(expired) > PARALLEL_UNLINK_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=UNLINK_WORKERS) as executor:
+                removed = list(executor.map(self._unlink_temp_file, expired))
+        else:
+            removed = [self._unlink_temp_file(temp_file) for temp_file in expired]
+        keep.update(temp_file for temp_file, ok in zip(expired, removed) if not ok)
+        self.temp_files |= keep
                 
         # Clean up old API call records
+        now = time.monotonic()
         self.api_calls = [
             call_time for call_time in self.api_calls 
-            if current_time - call_time < timedelta(minutes=1)
+            if now - call_time < RATE_LIMIT_WINDOW_SECONDS
         ]
         
+    def _unlink_temp_file(self, temp_file: Path) -> bool:
+        """Delete a temp file, returning False if it has to be retried later."""
+        try:
+            temp_file.unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            self.logger.error(f"Error cleaning up temp file {temp_file}: {e}")
+            return False
+
     def register_temp_file(self, file_path: Path):
         """Register a temporary file for cleanup."""
         self.temp_files.add(Path(file_path))
         
     def check_rate_limit(self) -> bool:
         """Check if API rate limit has been exceeded."""
-        current_time = datetime.now()
+        current_time = time.monotonic()
         self.api_calls = [
             call_time for call_time in self.api_calls 
-            if current_time - call_time < timedelta(minutes=1)
+            if current_time - call_time < RATE_LIMIT_WINDOW_SECONDS
         ]
         
         if len(self.api_calls) >= self.config.api_rate_limit:
@@ -1,33 +1,56 @@
+from datetime import datetime
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
+from pydantic import BaseModel, BeforeValidator
+from typing import Annotated, List, Dict
 from suggestion_db import SuggestionDB
 
 app = FastAPI()
 db = SuggestionDB()
 
+def _ns_to_iso(timestamp):
+    """Render a stored nanosecond timestamp as local ISO-8601 text."""
+    if not isinstance(timestamp, int):
+        return timestamp
+    seconds, nanos = divmod(timestamp, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000).isoformat()
+
+# Storage keeps integer nanoseconds, but JSON clients such as JavaScript read
+# numbers as doubles, which cannot hold them exactly
+IsoTimestamp = Annotated[str, BeforeValidator(_ns_to_iso)]
+
 class Suggestion(BaseModel):
     file: str
     question: str
     response: Dict
     model: str
 
+class SuggestionSummary(BaseModel):
+    id: int
+    file: str
+    question: str
+    model: str
+    timestamp: IsoTimestamp
+
 class SuggestionResponse(BaseModel):
     id: int
     file: str
     question: str
     response: Dict
     model: str
-    timestamp: str
+    timestamp: IsoTimestamp
 
 @app.post("/suggestions/", response_model=SuggestionResponse)
 def create_suggestion(suggestion: Suggestion):
-    db.add_suggestion(suggestion.file, suggestion.question, suggestion.response, suggestion.model)
-    return db.get_suggestions(suggestion.file)[0]
+    return db.add_suggestion(suggestion.file, suggestion.question, suggestion.response, suggestion.model)
 
 @app.get("/suggestions/", response_model=List[SuggestionResponse])
-def read_suggestions(file: str = None):
-    return db.get_suggestions(file)
+def read_suggestions(file: str = None, offset: int = 0, limit: int = None):
+    return db.get_suggestions(file, limit=limit, offset=offset)
+
+# Declared before /suggestions/{suggestion_id} so "summaries" is not taken as an id
+@app.get("/suggestions/summaries", response_model=List[SuggestionSummary])
+def read_suggestion_summaries(file: str = None, offset: int = 0, limit: int = None):
+    return db.get_suggestion_summaries(file, limit=limit, offset=offset)
 
 @app.get("/suggestions/{suggestion_id}", response_model=SuggestionResponse)
 def read_suggestion(suggestion_id: int):
@@ -1,4 +1,5 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from rich.console import Console
 from rich.table import Table
@@ -6,9 +7,15 @@ from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.prompt import Confirm
 
-def display_suggestions(suggestions):
+API_URL = "http://localhost:8000"
+BATCH_WORKERS = 8
+
+# Shared session so repeated calls reuse the same keep-alive connection
+SESSION = requests.Session()
+
+def display_suggestions(suggestions, page=1):
     console = Console()
-    table = Table(title="Aider Suggestions")
+    table = Table(title=f"Aider Suggestions (page {page})")
     
     table.add_column("ID", style="cyan", no_wrap=True)
     table.add_column("File", style="magenta")
@@ -39,7 +46,7 @@ def display_suggestion_detail(suggestion, highlight):
 
 def delete_suggestion(suggestion_id):
     console = Console()
-    response = requests.delete(f"http://localhost:8000/suggestions/{suggestion_id}")
+    response = SESSION.delete(f"{API_URL}/suggestions/{suggestion_id}")
     if response.status_code == 200:
         suggestion = response.json()
         console.print("[yellow]Are you sure you want to delete the following suggestion?[/yellow]")
@@ -49,7 +56,7 @@ def delete_suggestion(suggestion_id):
         console.print(f"[yellow]Response (first 100 characters):[/yellow] {suggestion['response']['response'][:100]}...")
         
         if Confirm.ask("Confirm deletion?"):
-            delete_response = requests.post(f"http://localhost:8000/suggestions/{suggestion_id}/confirm_delete")
+            delete_response = SESSION.post(f"{API_URL}/suggestions/{suggestion_id}/confirm_delete")
             if delete_response.status_code == 200:
                 console.print("[green]Suggestion deleted successfully.[/green]")
             else:
@@ -59,27 +66,47 @@ def delete_suggestion(suggestion_id):
     else:
         console.print(f"[red]Error: Unable to fetch suggestion with ID {suggestion_id}[/red]")
 
+def fetch_suggestion(suggestion_id):
+    response = SESSION.get(f"{API_URL}/suggestions/{suggestion_id}")
+    return response.json() if response.status_code == 200 else None
+
+def display_batch(suggestion_ids, highlight):
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+        results = executor.map(fetch_suggestion, suggestion_ids)
+        for suggestion_id, suggestion in zip(suggestion_ids, results):
+            if suggestion:
+                display_suggestion_detail(suggestion, highlight)
+            else:
+                print(f"Error: Unable to fetch suggestion with ID {suggestion_id}")
+
 def main():
     parser = argparse.ArgumentParser(description="Aider Suggestions CLI")
     parser.add_argument("--id", type=int, help="Display details for a specific suggestion ID")
     parser.add_argument("--highlight", action="store_true", help="Enable syntax highlighting")
     parser.add_argument("--delete", type=int, help="Delete a specific suggestion by ID")
+    parser.add_argument("--page", type=int, default=1, help="Page of suggestions to list")
+    parser.add_argument("--page-size", type=int, default=50, help="Number of suggestions per page")
+    parser.add_argument("--batch", type=int, nargs="+", metavar="ID",
+                        help="Display details for several suggestion IDs fetched in parallel")
     args = parser.parse_args()
 
     if args.delete:
         delete_suggestion(args.delete)
+    elif args.batch:
+        display_batch(args.batch, args.highlight)
     elif args.id:
-        response = requests.get(f"http://localhost:8000/suggestions/{args.id}")
+        response = SESSION.get(f"{API_URL}/suggestions/{args.id}")
         if response.status_code == 200:
             suggestion = response.json()
             display_suggestion_detail(suggestion, args.highlight)
         else:
             print(f"Error: Unable to fetch suggestion with ID {args.id}")
     else:
-        response = requests.get("http://localhost:8000/suggestions/")
+        params = {"offset": (args.page - 1) * args.page_size, "limit": args.page_size}
+        response = SESSION.get(f"{API_URL}/suggestions/", params=params)
         if response.status_code == 200:
             suggestions = response.json()
-            display_suggestions(suggestions)
+            display_suggestions(suggestions, args.page)
         else:
             print("Error: Unable to fetch suggestions")
 
@@ -1,26 +1,199 @@
+import json
 import sqlite3
 import os
+import queue
 import sys
-from typing import List, Dict
-import json
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from logger import Logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Responses are stored as UTF-8 JSON bytes in a BLOB column, which both
+# orjson.loads and json.loads read back without a str round-trip. Rows
+# written as TEXT by older versions still decode the same way.
+# Sorted keys keep identical responses byte-identical in the database;
+# non-str keys are accepted the same way json.dumps accepted them
+if orjson is not None:
+    _JSON_DUMPS_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=_JSON_DUMPS_OPTIONS)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    _loads = json.loads
+
+def _decode_response(raw):
+    """Parse a stored response, passing plain-text values through unparsed.
+
+    Responses are always written as JSON objects, so anything that does not
+    open with '{' or '[' (e.g. text stored by hand) is returned as a str
+    without running the JSON parser over it.
+    """
+    if raw[:1] in (b'{', b'[', '{', '['):
+        return _loads(raw)
+    return raw.decode('utf-8') if isinstance(raw, bytes) else raw
+
+
+def _is_memory_path(db_path: str) -> bool:
+    """True for ':memory:' and for file: URIs that open an in-memory database."""
+    if db_path == ':memory:':
+        return True
+    if not db_path.startswith('file:'):
+        return False
+    location, _, query = db_path[len('file:'):].partition('?')
+    return location == ':memory:' or 'mode=memory' in query.split('&')
+
+
+class SuggestionRow(MutableMapping):
+    """A suggestion row that only decodes its response when it is first read.
+
+    List views that show file, question and timestamp never pay for the
+    JSON parse. Behaves like a dict otherwise, but is not a dict subclass:
+    call to_dict() before handing it to json.dumps or jsonify.
+    """
+
+    __slots__ = ('_data', '_decoded')
+
+    def __init__(self, row):
+        self._data = dict(row)
+        self._decoded = False
+
+    def __getitem__(self, key):
+        if key == 'response' and not self._decoded:
+            self._data['response'] = _decode_response(self._data['response'])
+            self._decoded = True
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key == 'response':
+            self._decoded = True
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self) -> Dict:
+        """Return a plain dict with the response decoded."""
+        return dict(self)
+
+
+class ConnectionPool:
+    """A small pool of read connections, opened lazily up to n_readers.
+
+    Writes stay on SuggestionDB's own connection; with WAL the readers see
+    every committed write without blocking on the writer.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], n_readers: int = 4,
+                 timeout: float = 30.0):
+        self._connect = connect
+        self._n_readers = n_readers
+        # A reader that is never returned must not hang every later read
+        self._timeout = timeout
+        self._idle = queue.Queue()
+        self._opened = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection, waiting up to the timeout if all are in use."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self._n_readers
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            try:
+                return self._idle.get(timeout=self._timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    f"No reader connection became free within {self._timeout} seconds"
+                ) from None
+        try:
+            conn = self._connect()
+            # Readers never write, so make that a hard guarantee
+            conn.execute('PRAGMA query_only=ON')
+            return conn
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close idle readers; borrowed ones are closed when they come back."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class SuggestionDB:
     """A simple SQLite database wrapper for storing code suggestions."""
     def __init__(self, db_path: str = "suggestions.db", force_file: bool = False):
         self.logger = Logger()
-        self.logger.info(f"Initializing SuggestionDB with path: {db_path}")
-        self.db_path = db_path if force_file else (':memory:' if 'pytest' in sys.modules else db_path)
+        self.logger.info("Initializing SuggestionDB with path: %s", db_path)
+        # In-memory databases are kept as given, so tests can share one
+        # through a file::memory:?cache=shared style URI
+        if force_file or _is_memory_path(db_path) or 'pytest' not in sys.modules:
+            self.db_path = db_path
+        else:
+            self.db_path = ':memory:'
+        self._uri = self.db_path.startswith('file:')
+        self._in_memory = _is_memory_path(self.db_path)
         
         # Create db directory if needed
-        if self.db_path != ':memory:':
+        if not self._in_memory and not self._uri:
             db_dir = os.path.dirname(db_path)
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir)
 
-        # Initialize connection
+        # Initialize connection; the writer connection is shared across
+        # threads, so writes are serialized on a lock. Reads borrow from a
+        # pool, except for in-memory databases which read through the
+        # writer connection.
         self._conn = None
+        self._pool = None
+        self._write_lock = threading.Lock()
         self._initialize_db()
 
     def __enter__(self):
@@ -38,141 +211,270 @@ class SuggestionDB:
             finally:
                 self._conn.close()
                 self._conn = None
+                self._close_pool()
 
-    def _initialize_db(self):
-        """Initialize database connection and create table if needed."""
-        self.logger.info(f"Initializing database connection to: {self.db_path}")
-        self._conn = sqlite3.connect(
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the pragmas and row factory applied."""
+        conn = sqlite3.connect(
             self.db_path,
-            timeout=30,
+            timeout=self.BUSY_TIMEOUT_MS / 1000,
+            uri=self._uri,
             isolation_level=None,  # Enable autocommit mode
             check_same_thread=False
         )
-        
-        # Set pragmas for better reliability
-        self._conn.execute('PRAGMA journal_mode=WAL')
-        self._conn.execute('PRAGMA synchronous=NORMAL')
-        self._conn.execute('PRAGMA foreign_keys=ON')
-        self._conn.execute('PRAGMA temp_store=MEMORY')
-        self._conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _close_pool(self):
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+
+    def _initialize_db(self):
+        """Initialize database connection and create table if needed."""
+        self.logger.info("Initializing database connection to: %s", self.db_path)
+        self._conn = self._connect()
 
         try:
             self.logger.info("Creating database table if needed")
             cursor = self._conn.cursor()
-            self.logger.info(f"Executing CREATE TABLE SQL: {self.CREATE_TABLE_SQL}")
+            self.logger.info("Executing CREATE TABLE SQL: %s", self.CREATE_TABLE_SQL)
             cursor.execute(self.CREATE_TABLE_SQL)
+            cursor.execute(self.CREATE_INDEX_SQL)
+            self._migrate(cursor)
             self.logger.info("Verifying table creation")
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='suggestions'")
             result = cursor.fetchone()
-            self.logger.info(f"Table verification result: {result}")
+            self.logger.info("Table verification result: %s", result)
             if not result:
                 self.logger.error("Failed to create suggestions table")
                 raise sqlite3.OperationalError("Failed to create suggestions table")
             self._conn.commit()
             self.logger.info("Table creation successful")
         except sqlite3.Error as e:
-            self.logger.error(f"Database initialization error: {e}")
+            self.logger.error("Database initialization error: %s", e)
+            raise
+
+        if not self._in_memory:
+            self._pool = ConnectionPool(
+                self._connect, self.READER_POOL_SIZE, timeout=self.BUSY_TIMEOUT_MS / 1000
+            )
+
+    def _migrate(self, cursor):
+        """Bring rows written by older versions up to SCHEMA_VERSION."""
+        if cursor.execute('PRAGMA user_version').fetchone()[0] >= self.SCHEMA_VERSION:
+            return
+        # Take the write lock first so two processes never convert the same rows
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Version 0 stored naive local datetime.isoformat() strings
+            rows = cursor.execute(
+                "SELECT id, timestamp FROM suggestions WHERE typeof(timestamp) = 'text'"
+            ).fetchall()
+            if rows:
+                self.logger.info("Converting %d suggestion timestamps to integers", len(rows))
+                cursor.executemany(
+                    "UPDATE suggestions SET timestamp = ? WHERE id = ?",
+                    [(round(datetime.fromisoformat(ts).timestamp() * 1_000_000) * 1000, row_id)
+                     for row_id, ts in rows]
+                )
+            cursor.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
             raise
 
+    def _apply_pragmas(self, conn):
+        """Configure a freshly opened connection; run once per connection."""
+        if not self._in_memory:
+            # WAL lets readers run alongside the writer; neither WAL nor mmap
+            # applies to in-memory databases
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'PRAGMA mmap_size={self.MMAP_SIZE}')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')  # 64 MB page cache
+
     def __del__(self):
         """Cleanup database connection when object is destroyed."""
         if hasattr(self, '_conn') and self._conn:
             try:
                 self._conn.close()
+                self._close_pool()
             except Exception as e:
-                self.logger.error(f"Error closing database connection: {e}")
+                self.logger.error("Error closing database connection: %s", e)
 
     def _get_connection(self):
         """Get a database connection, reconnecting if needed."""
         if not self._conn:
+            # _initialize_db applies the pragmas on the new connection
             self._initialize_db()
-            # Enable WAL mode for better concurrency
-            self._conn.execute('PRAGMA journal_mode=WAL')
-            # Enable foreign keys
-            self._conn.execute('PRAGMA foreign_keys=ON')
         return self._conn
 
-    def _verify_table(self, conn):
-        """Verify that the suggestions table exists."""
-        cursor = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='suggestions'"
-        )
-        if not cursor.fetchone():
-            raise sqlite3.OperationalError("Failed to create suggestions table")
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection, or share the writer for in-memory databases."""
+        conn = self._get_connection()
+        if self._pool is None:
+            yield conn
+        else:
+            with self._pool.reader() as reader:
+                yield reader
 
-    # SQL for creating the suggestions table
+    # Bumped whenever existing databases need _migrate to rewrite data
+    SCHEMA_VERSION = 1
+
+    # SQL for creating the suggestions table; timestamp holds nanoseconds
+    # since the epoch (time.time_ns()) so ordering compares plain integers
     CREATE_TABLE_SQL = """
         CREATE TABLE IF NOT EXISTS suggestions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             file TEXT NOT NULL,
             question TEXT NOT NULL,
-            response JSON NOT NULL,
+            response BLOB NOT NULL,
             model TEXT NOT NULL,
-            timestamp DATETIME NOT NULL
+            timestamp INTEGER NOT NULL
         )
     """
 
-    def _create_table(self, conn):
-        """Create the suggestions table if it doesn't exist."""
-        try:
-            cursor = conn.cursor()
-            cursor.execute(self.CREATE_TABLE_SQL)
-            cursor.close()
-        except sqlite3.Error as e:
-            print(f"Error creating table: {e}")
-            raise sqlite3.OperationalError(f"Failed to create suggestions table: {e}")
+    # Lets get_suggestions(file=...) walk an index range instead of scanning
+    # and sorting the whole table
+    CREATE_INDEX_SQL = """
+        CREATE INDEX IF NOT EXISTS idx_file_ts ON suggestions (file, timestamp DESC)
+    """
 
-    def add_suggestion(self, file: str, question: str, response: Dict, model: str):
-        self.logger.info(f"Adding suggestion for file: {file}")
+    # Statements are kept as constants so every call passes the identical
+    # string and hits the connection's prepared statement cache
+    INSERT_SQL = (
+        "INSERT INTO suggestions (file, question, response, model, timestamp) VALUES (?, ?, ?, ?, ?) "
+        "RETURNING id, file, question, response, model, timestamp"
+    )
+    INSERT_MANY_SQL = "INSERT INTO suggestions (file, question, response, model, timestamp) VALUES (?, ?, ?, ?, ?)"
+    SELECT_ALL_SQL = (
+        "SELECT id, file, question, response, model, timestamp FROM suggestions "
+        "ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    )
+    SELECT_BY_FILE_SQL = (
+        "SELECT id, file, question, response, model, timestamp FROM suggestions "
+        "WHERE file = ? ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    )
+    # List views never show the response, so the summaries skip reading it
+    SELECT_SUMMARIES_SQL = (
+        "SELECT id, file, question, model, timestamp FROM suggestions "
+        "ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    )
+    SELECT_SUMMARIES_BY_FILE_SQL = (
+        "SELECT id, file, question, model, timestamp FROM suggestions "
+        "WHERE file = ? ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    )
+    SELECT_ONE_SQL = "SELECT id, file, question, response, model, timestamp FROM suggestions WHERE id = ?"
+    UPDATE_SQL = "UPDATE suggestions SET response = ? WHERE id = ?"
+    DELETE_SQL = "DELETE FROM suggestions WHERE id = ?"
+
+    READER_POOL_SIZE = 4
+
+    BUSY_TIMEOUT_MS = 30000
+    MMAP_SIZE = 268435456  # 256 MB
+
+    def add_suggestion(self, file: str, question: str, response: Dict, model: str) -> Dict:
+        self.logger.info("Adding suggestion for file: %s", file)
         conn = self._get_connection()
-        try:
-            conn.execute(
-                "INSERT INTO suggestions (file, question, response, model, timestamp) VALUES (?, ?, ?, ?, ?)",
-                (file, question, json.dumps(response), model, datetime.now().isoformat())
-            )
-            conn.commit()
-            self.logger.info("Successfully added suggestion")
-        except sqlite3.Error as e:
-            self.logger.error(f"Error adding suggestion: {e}")
-            conn.rollback()
-            raise
+        with self._write_lock:
+            try:
+                cursor = conn.execute(
+                    self.INSERT_SQL,
+                    (file, question, _dumps(response), model, time.time_ns())
+                )
+                row = cursor.fetchone()
+                cursor.close()
+                conn.commit()
+                self.logger.info("Successfully added suggestion")
+            except sqlite3.Error as e:
+                self.logger.error("Error adding suggestion: %s", e)
+                conn.rollback()
+                raise
+        suggestion = dict(row)
+        # The caller already holds the decoded response, no need to parse it back
+        suggestion['response'] = response
+        return suggestion
 
-    def get_suggestions(self, file: str = None) -> List[Dict]:
+    def add_suggestions(self, items: Iterable[Tuple[str, str, Dict, str]]) -> int:
+        """Insert (file, question, response, model) tuples in a single transaction.
+
+        The connection stays in autocommit mode for the single-row methods, so
+        the batch opens its own transaction and pays for one commit in total.
+        """
+        rows = [
+            (file, question, _dumps(response), model, time.time_ns())
+            for file, question, response, model in items
+        ]
+        if not rows:
+            return 0
+        self.logger.info("Adding %d suggestions", len(rows))
         conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        if file:
-            cursor = conn.execute(
-                "SELECT * FROM suggestions WHERE file = ? ORDER BY timestamp DESC",
-                (file,)
-            )
-        else:
-            cursor = conn.execute("SELECT * FROM suggestions ORDER BY timestamp DESC")
-        
-        results = []
-        for row in cursor.fetchall():
-            suggestion = dict(row)
-            suggestion['response'] = json.loads(suggestion['response'])
-            results.append(suggestion)
-        return results
-
-    def get_suggestion(self, suggestion_id: int) -> Dict:
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM suggestions WHERE id = ?", (suggestion_id,))
+        with self._write_lock:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(self.INSERT_MANY_SQL, rows)
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self.logger.error("Error adding suggestions: %s", e)
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def iter_suggestions(self, file: str = None, limit: int = 100, offset: int = 0) -> Iterator[SuggestionRow]:
+        """Yield suggestions newest first; each response is decoded on first access.
+
+        The page is fetched up front; pass limit=None to fetch every matching row.
+        """
+        # LIMIT -1 means no limit in SQLite, so a single statement covers both cases
+        page = (-1 if limit is None else limit, offset)
+        # Fetch the page before yielding so a caller that stops early never
+        # keeps a pooled reader borrowed while the generator is suspended
+        with self._reader() as conn:
+            if file:
+                rows = conn.execute(self.SELECT_BY_FILE_SQL, (file, *page)).fetchall()
+            else:
+                rows = conn.execute(self.SELECT_ALL_SQL, page).fetchall()
+
+        for row in rows:
+            yield SuggestionRow(row)
+
+    def get_suggestions(self, file: str = None, limit: int = 100, offset: int = 0) -> List[SuggestionRow]:
+        return list(self.iter_suggestions(file, limit=limit, offset=offset))
+
+    def get_suggestion_summaries(self, file: str = None, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Return suggestions newest first without their (potentially large) responses."""
+        page = (-1 if limit is None else limit, offset)
+        with self._reader() as conn:
+            if file:
+                cursor = conn.execute(self.SELECT_SUMMARIES_BY_FILE_SQL, (file, *page))
+            else:
+                cursor = conn.execute(self.SELECT_SUMMARIES_SQL, page)
+            return [dict(row) for row in cursor]
+
+    def get_suggestion(self, suggestion_id: int) -> Optional[SuggestionRow]:
+        with self._reader() as conn:
+            cursor = conn.execute(self.SELECT_ONE_SQL, (suggestion_id,))
             row = cursor.fetchone()
             if row:
-                suggestion = dict(row)
-                suggestion['response'] = json.loads(suggestion['response'])
-                return suggestion
+                return SuggestionRow(row)
             return None
 
     def update_suggestion(self, suggestion_id: int, response: Dict):
-        with self._get_connection() as conn:
+        with self._write_lock, self._get_connection() as conn:
             conn.execute(
-                "UPDATE suggestions SET response = ? WHERE id = ?",
-                (json.dumps(response), suggestion_id)
+                self.UPDATE_SQL,
+                (_dumps(response), suggestion_id)
             )
 
-    def delete_suggestion(self, suggestion_id: int):
-        with self._get_connection() as conn:
-            conn.execute("DELETE FROM suggestions WHERE id = ?", (suggestion_id,))
+    def delete_suggestion(self, suggestion_id: int) -> bool:
+        """Delete a suggestion, returning False if no row had that id."""
+        with self._write_lock, self._get_connection() as conn:
+            cursor = conn.execute(self.DELETE_SQL, (suggestion_id,))
+            return cursor.rowcount > 0
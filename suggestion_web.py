@@ -1,4 +1,6 @@
 import argparse
+import os
+import sys
 from base_app import create_base_app
 from blueprints.analyzer import analyzer
 from blueprints.suggestions import suggestions
@@ -6,11 +8,33 @@ from blueprints.suggestions import suggestions
 app = create_base_app()
 app.register_blueprint(analyzer)
 app.register_blueprint(suggestions)
+# Gunicorn workers import this module themselves, so --highlight reaches them
+# through the environment
+app.config['HIGHLIGHT'] = os.environ.get('SUGGESTION_WEB_HIGHLIGHT') == '1'
 
-if __name__ == '__main__':
+def main():
     parser = argparse.ArgumentParser(description="Run the Aider Suggestions web interface")
     parser.add_argument("--highlight", action="store_true", help="Enable syntax highlighting")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on")
+    parser.add_argument("--dev", action="store_true",
+                        help="Use Flask's built-in server instead of gunicorn")
     args = parser.parse_args()
 
-    app.config['HIGHLIGHT'] = args.highlight
-    app.run(debug=True, port=5000)
+    if args.dev:
+        app.config['HIGHLIGHT'] = args.highlight
+        app.run(debug=False, port=args.port)
+        return
+
+    # One gunicorn worker per CPU, each with its own SuggestionDB reader pool
+    os.environ['SUGGESTION_WEB_HIGHLIGHT'] = '1' if args.highlight else '0'
+    os.execvp(sys.executable, [
+        sys.executable, "-m", "gunicorn",
+        "--bind", f"127.0.0.1:{args.port}",
+        "--workers", str(os.cpu_count() or 1),
+        "--worker-class", "gthread",
+        "--threads", "4",
+        "suggestion_web:app",
+    ])
+
+if __name__ == '__main__':
+    main()
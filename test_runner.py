@@ -1,5 +1,7 @@
+import importlib.util
 import os
 import subprocess
+import sys
 from pathlib import Path
 import unittest
 from config import Config
@@ -38,9 +40,21 @@ class TestRunner:
 def run_all_tests():
     """
     Run all test cases in the project.
+
+    Uses pytest-xdist to spread the test files over every CPU when it is
+    installed, and falls back to a serial unittest run otherwise.
     """
+    test_dir = str(Path(__file__).parent)
+    if importlib.util.find_spec("xdist") is not None:
+        result = subprocess.run(
+            # loadfile keeps each module's shared fixtures on one worker
+            [sys.executable, "-m", "pytest", "-n", "auto", "--dist", "loadfile", test_dir],
+            check=False
+        )
+        return result.returncode == 0
+
     test_loader = unittest.TestLoader()
-    test_suite = test_loader.discover(str(Path(__file__).parent), pattern="test_*.py")
+    test_suite = test_loader.discover(test_dir, pattern="test_*.py")
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(test_suite)
@@ -1,9 +1,32 @@
+import copy
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
 import pytest
 
-@pytest.fixture(autouse=True)
-def setup_test_config(tmp_path, monkeypatch):
-    """Setup test configuration before any tests run"""
-    config_path = tmp_path / "config_local.yaml"
+@dataclass
+class FakeConfig:
+    """A plain stand-in for Config with the attributes the components read"""
+    aider_model: str = "test-model"
+    aider_weak_model: str = "test-weak-model"
+    repo_path: Path = Path(".")
+    api_rate_limit: int = 60
+    max_memory_mb: int = 512
+    max_cpu_percent: float = 80.0
+    cleanup_threshold_mb: int = 400
+    db_path: str = "test.db"
+
+
+@pytest.fixture(scope="session")
+def fake_config_factory():
+    """Build FakeConfig doubles; tests should not import conftest directly"""
+    return FakeConfig
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_config(tmp_path_factory):
+    """Setup test configuration once, before any tests run"""
+    config_path = tmp_path_factory.mktemp("cfg") / "config_local.yaml"
     with open(config_path, 'w') as f:
         f.write("""
 REPO_PATH: '.'
@@ -37,7 +60,53 @@ DANGEROUS_PATTERNS:
     default: ['rm -rf', 'sudo', 'chmod']
     python: ['os.system', 'subprocess']
 """)
-    monkeypatch.setenv('PYTEST_CURRENT_TEST', 'True')
-    # Set config path before any imports
-    monkeypatch.setattr('blueprints.analyzer.get_config_path', lambda: str(config_path))
-    return config_path
+    # The function-scoped monkeypatch fixture is not available here
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'True')
+        # Set config path before any imports
+        monkeypatch.setattr('blueprints.analyzer.get_config_path', lambda: str(config_path))
+        # validate_input resolves its own path relative to the cwd, which
+        # other tests change
+        monkeypatch.setattr('validators.get_config_path', lambda: str(config_path))
+        yield config_path
+
+
+@pytest.fixture(scope="session")
+def agent_config_template():
+    """Parsed agent configuration, built once per session"""
+    return {
+        "VENV_DIR": "venv",
+        "TEST_COMMAND": ["pytest"],
+        "MAX_LINE_LENGTH": 100,
+        "AUTOPEP8_FIX": True,
+        "AIDER_MODEL": "test-model",
+        "AIDER_WEAK_MODEL": "test-weak-model",
+        "LINTER": "pylint",
+        "LINE_COUNT_MAX": 20,
+        "LINE_COUNT_MIN": 10,
+        "ENABLE_BLACK": True,
+        "LANGUAGE_MAX_LENGTHS": {
+            "default": 50000,
+            "python": 50000
+        },
+        "DANGEROUS_PATTERNS": {
+            "default": ["rm -rf", "sudo", "chmod"],
+            "python": ["os.system", "subprocess"]
+        }
+    }
+
+
+@pytest.fixture
+def agent_config_data(agent_config_template):
+    """A per-test copy of the agent configuration that tests may modify"""
+    return copy.deepcopy(agent_config_template)
+
+
+@pytest.fixture(scope="session")
+def flask_app_parts(setup_test_config):
+    """Import the Flask app factory and blueprints once the config is in place"""
+    from base_app import create_base_app
+    from blueprints.analyzer import analyzer
+    from blueprints.suggestions import suggestions
+    return SimpleNamespace(create_base_app=create_base_app, analyzer=analyzer,
+                           suggestions=suggestions)
@@ -1,21 +1,25 @@
-import sys
 from pathlib import Path
 from unittest.mock import patch, Mock, mock_open
 
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
-
-import tempfile
+import io
 
 import os
-import yaml
 import pytest
-import subprocess
 from logger import Logger
 from config import Config
 from command_runner import CommandRunner
+from git_manager import GitManager
+from aider_runner import AiderRunner
+from linter_runner import LinterRunner
 from agent_v2 import Agent, AgentComponents
 
+# Twenty lines of fake source served by the patched open() in test_run
+_MOCK_FILE_CONTENT = "\n".join(f"line {i}" for i in range(20))
+
+
+def _no_sleep(seconds):
+    """Sleeper passed to Agent so runs skip their review pauses"""
+
 
 def test_agent_initialization():
     config_path = Path("config_local.yaml")
@@ -30,128 +34,138 @@ def test_get_tracked_files(mock_repo):
     """Test the get_tracked_files method"""
     config_path = Path("config.yaml")
     agent = Agent(config_path)
-    mock_repo.return_value.git.ls_files.return_value = "file1.py\nfile2.py"
+    mock_repo.return_value.git.ls_files.return_value = "file1.py\0file2.py\0"
     mock_repo.return_value.working_dir = "/test/repo"
 
     tracked_files = agent.get_tracked_files()
 
+    mock_repo.return_value.git.ls_files.assert_called_once_with('-z', '--', '*.py')
     assert tracked_files == ["/test/repo/file1.py", "/test/repo/file2.py"]
 
 @patch('builtins.open', new_callable=mock_open, read_data="dummy_config_data")
-def test_run(mock_open):
+def test_run(mock_open, tmp_path, monkeypatch):
     """Test the run method"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        with patch("yaml.safe_load") as mock_yaml_load, patch(
-            "agent_v2.FileProcessor.process_file"
-        ) as mock_process_file, patch(
-            "agent_v2.Agent.get_tracked_files"
-        ) as mock_get_tracked_files, patch(
-            "pathlib.Path.exists"
-        ) as mock_path_exists, patch(
-            "time.sleep"
-        ), patch(
-            "agent_v2.GitManager.is_git_repo"
-        ) as mock_is_git_repo:
-
-            mock_yaml_load.return_value = {
-                "REPO_PATH": temp_dir,
-                "VENV_PATH": os.path.join(temp_dir, "venv"),
-                "VENV_DIR": "venv",
-                "TEST_COMMAND": ["python", "-m", "pytest"],
-                "AIDER_PATH": os.path.join(temp_dir, "aider"),
-                "MAX_LINE_LENGTH": 100,
-                "LANGUAGE_MAX_LENGTHS": {
-                    "default": 50000,
-                    "python": 50000
-                },
-                "DANGEROUS_PATTERNS": {
-                    "default": ["rm -rf", "sudo", "chmod"],
-                    "python": ["os.system", "subprocess"]
-                }
+    temp_dir = str(tmp_path)
+    # agent.run() changes into REPO_PATH; restore the cwd afterwards
+    monkeypatch.chdir(temp_dir)
+    with patch("yaml.load") as mock_yaml_load, patch(
+        "agent_v2.FileProcessor.process_file"
+    ) as mock_process_file, patch(
+        "agent_v2.Agent.get_tracked_files"
+    ) as mock_get_tracked_files, patch(
+        "pathlib.Path.exists"
+    ) as mock_path_exists, patch(
+        "agent_v2.GitManager.is_git_repo"
+    ) as mock_is_git_repo:
+
+        mock_yaml_load.return_value = {
+            "REPO_PATH": temp_dir,
+            "VENV_PATH": os.path.join(temp_dir, "venv"),
+            "VENV_DIR": "venv",
+            "TEST_COMMAND": ["python", "-m", "pytest"],
+            "AIDER_PATH": os.path.join(temp_dir, "aider"),
+            "MAX_LINE_LENGTH": 100,
+            "LANGUAGE_MAX_LENGTHS": {
+                "default": 50000,
+                "python": 50000
+            },
+            "DANGEROUS_PATTERNS": {
+                "default": ["rm -rf", "sudo", "chmod"],
+                "python": ["os.system", "subprocess"]
             }
-            mock_path_exists.return_value = True
-            mock_is_git_repo.return_value = True
+        }
+        mock_path_exists.return_value = True
+        mock_is_git_repo.return_value = True
+
+        config_path = Path(os.path.join(temp_dir, "config.yaml"))
 
-            config_path = Path(os.path.join(temp_dir, "config.yaml"))
+        agent = Agent(config_path, sleeper=_no_sleep)
 
-            agent = Agent(config_path)
+        mock_file1 = Path(os.path.join(temp_dir, "file1.py"))
+        mock_file2 = Path(os.path.join(temp_dir, "file2.py"))
+        mock_get_tracked_files.return_value = [mock_file1, mock_file2]
 
-            mock_file1 = Path(os.path.join(temp_dir, "file1.py"))
-            mock_file2 = Path(os.path.join(temp_dir, "file2.py"))
-            mock_get_tracked_files.return_value = [mock_file1, mock_file2]
+        def fake_open(*args, **kwargs):
+            return io.StringIO(_MOCK_FILE_CONTENT)
 
-            mock_file_content = "\n".join(["line " + str(i) for i in range(20)])
-            file_mock = mock_open(read_data=mock_file_content)
-            file_mock.return_value.__iter__.return_value = mock_file_content.splitlines(True)
-            with patch("builtins.open", file_mock), patch("pathlib.Path.exists", return_value=True), patch("agent_v2.Agent.rawgencount", return_value=20):
-                agent.run(debug=True)
+        with patch("builtins.open", fake_open), patch("pathlib.Path.exists", return_value=True), patch("agent_v2.Agent.rawgencount", return_value=20):
+            agent.run(debug=True)
 
-            mock_process_file.assert_any_call(mock_file1)
-            mock_process_file.assert_any_call(mock_file2)
+        mock_process_file.assert_any_call(mock_file1)
+        mock_process_file.assert_any_call(mock_file2)
 
-        mock_get_tracked_files.assert_called_once()
-        assert mock_process_file.call_count == 2
+    mock_get_tracked_files.assert_called_once()
+    assert mock_process_file.call_count == 2
 
 
-def test_command_runner():
-    """Test the CommandRunner class"""
-    config = Mock(spec=Config)
-    logger = Mock(spec=Logger)
-    command_runner = CommandRunner(config, logger)
+@pytest.mark.parametrize("cls,arg_names", [
+    (CommandRunner, ("config", "logger")),
+    (GitManager, ("config", "command_runner", "logger")),
+    (AiderRunner, ("config", "command_runner", "logger")),
+    (LinterRunner, ("config", "logger")),
+])
+def test_component_assigns_deps(cls, arg_names):
+    """Test that each component keeps the dependencies it was built with"""
+    deps = {"config": Mock(spec=Config), "logger": Mock(spec=Logger), "command_runner": Mock(spec=CommandRunner)}
+    args = [deps[name] for name in arg_names]
+    component = cls(*args)
+
+    for name, value in zip(arg_names, args):
+        assert getattr(component, name) is value
 
-    assert command_runner.config == config
-    assert command_runner.logger == logger
 
+def _use_config(monkeypatch, config_data):
+    """Make Agent build its Config from config_data instead of a YAML file"""
+    config = Config.from_dict(config_data)
+    monkeypatch.setattr("agent_v2.Config", lambda config_path: config)
+    monkeypatch.setattr("agent_v2.Logger", Mock)
+    return config
 
-def test_verify_repo_path():
+
+def test_verify_repo_path(agent_config_data, monkeypatch):
     """Test the verify_repo_path method"""
-    with patch("agent_v2.Config") as mock_config, patch("agent_v2.Logger"), patch("agent_v2.GitManager.is_git_repo") as mock_is_git_repo:
-        mock_config.return_value.repo_path = Path("/test/repo")
-        mock_is_git_repo.return_value = True
-        
-        agent = Agent(Path("config.yaml"))
-        assert agent.verify_repo_path() == True
+    agent_config_data.update({"REPO_PATH": "/test/repo", "VENV_PATH": "/test/venv"})
+    _use_config(monkeypatch, agent_config_data)
+    is_git_repo = {"result": True}
+    monkeypatch.setattr("agent_v2.GitManager.is_git_repo", lambda self, path: is_git_repo["result"])
 
-        mock_is_git_repo.return_value = False
-        assert agent.verify_repo_path() == False
+    agent = Agent(Path("config.yaml"))
+    assert agent.verify_repo_path() == True
 
+    is_git_repo["result"] = False
+    assert agent.verify_repo_path() == False
 
-def test_display_config_summary(capsys):
+
+def test_display_config_summary(agent_config_data, monkeypatch, capsys):
     """Test the display_config_summary method"""
-    with patch("agent_v2.Config") as mock_config, patch("agent_v2.Logger"), \
-         patch("agent_v2.GitManager.is_git_repo", return_value=True):
-        mock_config.return_value.repo_path = Path("/test/repo")
-        mock_config.return_value.venv_path = Path("/test/venv")
-        mock_config.return_value.venv_dir = "venv"
-        mock_config.return_value.test_command = ["pytest"]
-        mock_config.return_value.aider_path = "/test/aider"
-        mock_config.return_value.max_line_length = 100
-        mock_config.return_value.autopep8_fix = True
-        mock_config.return_value.aider_model = "test-model"
-        mock_config.return_value.aider_weak_model = "test-weak-model"
-        mock_config.return_value.linter = "pylint"
-        mock_config.return_value.line_count_max = 1000
-        mock_config.return_value.line_count_min = 10
-        mock_config.return_value.enable_black = True
-    
-        agent = Agent(Path("/test/config.yaml"))
-        agent.display_config_summary()
-
-        captured = capsys.readouterr()
-        assert "Configuration Summary:" in captured.out
-        assert "Repository Path: /test/repo" in captured.out
-        assert "Virtual Environment Path: /test/venv" in captured.out
-        assert "Virtual Environment Directory: venv" in captured.out
-        assert "Test Command: ['pytest']" in captured.out
-        assert "Aider Path: /test/aider" in captured.out
-        assert "Max Line Length: 100" in captured.out
-        assert "Autopep8 Fix: True" in captured.out
-        assert "Aider Model: test-model" in captured.out
-        assert "Aider Weak Model: test-weak-model" in captured.out
-        assert "Linter: pylint" in captured.out
-        assert "Line Count Max: 1000" in captured.out
-        assert "Line Count Min: 10" in captured.out
-        assert "Enable Black: True" in captured.out
+    agent_config_data.update({
+        "REPO_PATH": "/test/repo",
+        "VENV_PATH": "/test/venv",
+        "AIDER_PATH": "/test/aider",
+        "LINE_COUNT_MAX": 1000,
+        "LINE_COUNT_MIN": 10,
+    })
+    _use_config(monkeypatch, agent_config_data)
+    monkeypatch.setattr("agent_v2.GitManager.is_git_repo", lambda self, path: True)
+
+    agent = Agent(Path("/test/config.yaml"))
+    agent.display_config_summary()
+
+    captured = capsys.readouterr()
+    assert "Configuration Summary:" in captured.out
+    assert "Repository Path: /test/repo" in captured.out
+    assert "Virtual Environment Path: /test/venv" in captured.out
+    assert "Virtual Environment Directory: venv" in captured.out
+    assert "Test Command: ['pytest']" in captured.out
+    assert "Aider Path: /test/aider" in captured.out
+    assert "Max Line Length: 100" in captured.out
+    assert "Autopep8 Fix: True" in captured.out
+    assert "Aider Model: test-model" in captured.out
+    assert "Aider Weak Model: test-weak-model" in captured.out
+    assert "Linter: pylint" in captured.out
+    assert "Line Count Max: 1000" in captured.out
+    assert "Line Count Min: 10" in captured.out
+    assert "Enable Black: True" in captured.out
 
 
 @pytest.mark.parametrize("file_count,line_count,expected_process_count", [
@@ -159,59 +173,89 @@ def test_display_config_summary(capsys):
     (3, 5, 0),   # No files should be processed (below min line count)
     (3, 25, 0),  # No files should be processed (above max line count)
 ])
-def test_run_with_different_file_sizes(file_count, line_count, expected_process_count):
+def test_run_with_different_file_sizes(file_count, line_count, expected_process_count, agent_config_data, tmp_path, monkeypatch):
     """Test the run method with different file sizes"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Initialize git repository
-        subprocess.run(["git", "init"], cwd=temp_dir, check=True)
-            
-        config_path = Path(os.path.join(temp_dir, "config.yaml"))
-        config_data = {
-            "REPO_PATH": temp_dir,
-            "VENV_PATH": os.path.join(temp_dir, "venv"),
-            "VENV_DIR": "venv",
-            "TEST_COMMAND": ["pytest"],
-            "AIDER_PATH": os.path.join(temp_dir, "aider"),
-            "MAX_LINE_LENGTH": 100,
-            "AUTOPEP8_FIX": True,
-            "AIDER_MODEL": "test-model",
-            "AIDER_WEAK_MODEL": "test-weak-model",
-            "LINTER": "pylint",
-            "LINE_COUNT_MAX": 20,
-            "LINE_COUNT_MIN": 10,
-            "ENABLE_BLACK": True,
-            "LANGUAGE_MAX_LENGTHS": {
-                "default": 50000,
-                "python": 50000
-            },
-            "DANGEROUS_PATTERNS": {
-                "default": ["rm -rf", "sudo", "chmod"],
-                "python": ["os.system", "subprocess"]
-            }
-        }
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+    temp_dir = str(tmp_path)
+    # agent.run() changes into REPO_PATH; restore the cwd afterwards
+    monkeypatch.chdir(temp_dir)
+    agent_config_data.update({
+        "REPO_PATH": temp_dir,
+        "VENV_PATH": os.path.join(temp_dir, "venv"),
+        "AIDER_PATH": os.path.join(temp_dir, "aider"),
+    })
+    config_path = Path(os.path.join(temp_dir, "config.yaml"))
     
-        with patch(
-            "agent_v2.FileProcessor.process_file"
-        ) as mock_process_file, patch(
-            "agent_v2.Agent.get_tracked_files"
-        ) as mock_get_tracked_files, patch(
-            "time.sleep"
-        ):
-            agent = Agent(config_path)
+    with patch(
+        "agent_v2.Config", return_value=Config.from_dict(agent_config_data)
+    ), patch(
+        "agent_v2.FileProcessor.process_file"
+    ) as mock_process_file, patch(
+        "agent_v2.Agent.get_tracked_files"
+    ) as mock_get_tracked_files, patch(
+        "agent_v2.GitManager.is_git_repo", return_value=True
+    ):
+        agent = Agent(config_path, sleeper=_no_sleep)
     
-            # Mock configuration
-            agent.config.line_count_min = 10
-            agent.config.line_count_max = 20
-            agent.config.venv_dir = "venv"
+        # Mock configuration
+        agent.config.line_count_min = 10
+        agent.config.line_count_max = 20
+        agent.config.venv_dir = "venv"
     
-            # Create mock files
-            mock_files = [Path(os.path.join(temp_dir, f"file{i}.py")) for i in range(file_count)]
-            mock_get_tracked_files.return_value = mock_files
+        # Create mock files
+        mock_files = [Path(os.path.join(temp_dir, f"file{i}.py")) for i in range(file_count)]
+        mock_get_tracked_files.return_value = mock_files
     
-            # Mock rawgencount to return the specified line count
-            with patch("agent_v2.Agent.rawgencount", return_value=line_count):
-                agent.run(debug=True)
+        # Mock rawgencount to return the specified line count
+        with patch("agent_v2.Agent.rawgencount", return_value=line_count):
+            agent.run(debug=True)
     
-        assert mock_process_file.call_count == expected_process_count
+    assert mock_process_file.call_count == expected_process_count
+
+
+@pytest.mark.parametrize("content,expected", [
+    (b"", 0),
+    (b"line 1\nline 2\n", 2),
+    (b"line 1\nline 2", 2),
+])
+def test_rawgencount(tmp_path, content, expected):
+    """Test that rawgencount matches text-mode line counting"""
+    file_path = tmp_path / "sample.py"
+    file_path.write_bytes(content)
+    assert Agent.rawgencount(file_path) == expected
+
+
+@pytest.mark.parametrize("path,skipped", [
+    ("src/module.py", False),
+    ("venv/lib/module.py", True),
+    ("pkg/.tox/py312/module.py", True),
+    ("lib/python3.12/site-packages/pkg/module.py", True),
+    ("proto/service_pb2.py", True),
+    ("src/venv_helpers.py", False),
+])
+def test_skip_patterns(path, skipped):
+    """Test that vendored and generated paths are skipped before scanning"""
+    assert bool(Agent.SKIP_PATTERNS.search(path)) == skipped
+
+
+@pytest.mark.parametrize("path,skipped", [
+    ("/home/dev/venv/myproj/src/module.py", False),
+    ("/home/dev/venv/myproj/venv/lib/module.py", True),
+    ("src/module.py", False),
+])
+def test_is_vendored_ignores_dirs_above_repo_root(path, skipped):
+    """Test that a repo checked out under a venv directory isn't skipped wholesale"""
+    repo_root = Path("/home/dev/venv/myproj")
+    assert Agent.is_vendored(Path(path), repo_root) == skipped
+
+
+def test_is_vendored_with_symlinked_repo_root(tmp_path):
+    """Test that a symlinked REPO_PATH pointing under a venv directory still matches"""
+    real_root = tmp_path / "venv" / "myproj"
+    (real_root / "src").mkdir(parents=True)
+    (real_root / "venv" / "lib").mkdir(parents=True)
+    link_root = tmp_path / "myproj-link"
+    link_root.symlink_to(real_root, target_is_directory=True)
+
+    assert not Agent.is_vendored(link_root / "src" / "module.py", link_root)
+    assert not Agent.is_vendored(real_root / "src" / "module.py", link_root)
+    assert Agent.is_vendored(link_root / "venv" / "lib" / "module.py", link_root)
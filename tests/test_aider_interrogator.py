@@ -1,30 +1,20 @@
 import os
 import pytest
 import time
-import sys
-from pathlib import Path
+import yaml
 from unittest.mock import Mock, patch
 
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
-
 from aider_interrogator import AiderInterrogator
 from agent_v2 import Agent
 from exceptions import AiderTimeoutError, AiderProcessError
 from config import Config
 
+# The libyaml emitter when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 @pytest.fixture
-def mock_config(tmp_path):
-    config = Mock(spec=Config)
-    config.aider_model = "test-model"
-    config.aider_weak_model = "test-weak-model"
-    config.repo_path = Path(".")
-    config.api_rate_limit = 60
-    config.max_memory_mb = 512
-    config.max_cpu_percent = 80.0
-    config.cleanup_threshold_mb = 400
-    config.db_path = str(tmp_path / "test.db")
-    return config
+def mock_config(tmp_path, fake_config_factory):
+    return fake_config_factory(db_path=str(tmp_path / "test.db"))
 
 @pytest.fixture
 def mock_command_runner():
@@ -34,8 +24,11 @@ def mock_command_runner():
 def mock_logger():
     return Mock()
 
-def test_ask_question_basic(mock_config, mock_command_runner, mock_logger):
-    interrogator = AiderInterrogator(mock_config, mock_command_runner, mock_logger)
+@pytest.fixture
+def interrogator(mock_config, mock_command_runner, mock_logger):
+    return AiderInterrogator(mock_config, mock_command_runner, mock_logger)
+
+def test_ask_question_basic(interrogator):
     with patch.object(interrogator, '_run_aider_process', return_value="Test response"):
         response = interrogator.ask_question(
             "def hello(): pass", 
@@ -43,23 +36,20 @@ def test_ask_question_basic(mock_config, mock_command_runner, mock_logger):
         )
         assert response == "Test response"
 
-def test_rate_limiting(mock_config, mock_command_runner, mock_logger):
-    interrogator = AiderInterrogator(mock_config, mock_command_runner, mock_logger)
+def test_rate_limiting(interrogator):
     # Force rate limit exceeded
     interrogator.resource_manager.check_rate_limit = Mock(return_value=False)
     
     with pytest.raises(AiderProcessError, match="API rate limit exceeded"):
         interrogator.ask_question("code", "question")
 
-def test_process_timeout(mock_config, mock_command_runner, mock_logger):
-    interrogator = AiderInterrogator(mock_config, mock_command_runner, mock_logger)
-    
+def test_process_timeout(interrogator):
     class MockProcess:
         def __init__(self):
             self.stdout = Mock()
             self.stderr = Mock()
             self.stdin = Mock()
-            self.stdout.readline.side_effect = lambda: time.sleep(0.2) or ""
+            self.stdout.readline.side_effect = lambda: time.sleep(0.02) or ""
         def poll(self):
             return None
         def terminate(self):
@@ -70,10 +60,9 @@ def test_process_timeout(mock_config, mock_command_runner, mock_logger):
             pass
     
     with pytest.raises(AiderTimeoutError):
-        interrogator._process_aider_output(MockProcess(), timeout=0.1)
+        interrogator._process_aider_output(MockProcess(), timeout=0.01)
 
-def test_resource_cleanup(mock_config, mock_command_runner, mock_logger):
-    interrogator = AiderInterrogator(mock_config, mock_command_runner, mock_logger)
+def test_resource_cleanup(interrogator):
     temp_file = interrogator._create_temp_file("test code")
     assert temp_file.exists()
     try:
@@ -84,47 +73,43 @@ def test_resource_cleanup(mock_config, mock_command_runner, mock_logger):
         if temp_file.exists():
             os.unlink(temp_file)
 
-def test_agent_initialization(mock_config, tmp_path):
-    # Initialize git repo and set current directory
-    import subprocess
-    import os
-    os.chdir(str(tmp_path))
-    subprocess.run(['git', 'init'], check=True)
-        
-    # Create a temporary config file
+@patch("agent_v2.GitManager.is_git_repo", return_value=True)
+def test_agent_initialization(mock_is_git_repo, mock_config, tmp_path):
     config_path = tmp_path / "test_config.yml"
+    config_data = {
+        "REPO_PATH": str(tmp_path),
+        "VENV_PATH": "venv",
+        "VENV_DIR": "venv",
+        "TEST_COMMAND": "pytest",
+        "AIDER_PATH": "aider",
+        "MAX_LINE_LENGTH": 100,
+        "AUTOPEP8_FIX": True,
+        "AIDER_MODEL": "test-model",
+        "AIDER_WEAK_MODEL": "test-weak-model",
+        "LINTER": "pylint",
+        "LINE_COUNT_MAX": 200,
+        "LINE_COUNT_MIN": 10,
+        "ENABLE_BLACK": False,
+        "MAX_CODE_LENGTH": 50000,
+        "MAX_QUESTION_LENGTH": 1000,
+        "MAX_MEMORY_MB": 512,
+        "MAX_CPU_PERCENT": 80.0,
+        "DB_CONNECTION_TIMEOUT": 30,
+        "DB_CONNECTION_RETRIES": 3,
+        "API_RATE_LIMIT": 60,
+        "CLEANUP_THRESHOLD_MB": 400,
+        "LANGUAGE_MAX_LENGTHS": {"default": 50000, "python": 50000},
+        "DANGEROUS_PATTERNS": {
+            "default": ["rm -rf", "sudo", "chmod"],
+            "python": ["os.system", "subprocess"]
+        },
+    }
     with open(config_path, 'w') as f:
-        f.write("""
-REPO_PATH: .
-VENV_PATH: venv
-VENV_DIR: venv
-TEST_COMMAND: pytest
-AIDER_PATH: aider
-MAX_LINE_LENGTH: 100
-AUTOPEP8_FIX: true
-AIDER_MODEL: test-model
-AIDER_WEAK_MODEL: test-weak-model
-LINTER: pylint
-LINE_COUNT_MAX: 200
-LINE_COUNT_MIN: 10
-ENABLE_BLACK: false
-MAX_CODE_LENGTH: 50000
-MAX_QUESTION_LENGTH: 1000
-MAX_MEMORY_MB: 512
-MAX_CPU_PERCENT: 80.0
-DB_CONNECTION_TIMEOUT: 30
-DB_CONNECTION_RETRIES: 3
-API_RATE_LIMIT: 60
-CLEANUP_THRESHOLD_MB: 400
-LANGUAGE_MAX_LENGTHS:
-    default: 50000
-    python: 50000
-DANGEROUS_PATTERNS:
-    default: ["rm -rf", "sudo", "chmod"]
-    python: ["os.system", "subprocess"]
-""")
-    
+        yaml.dump(config_data, f, Dumper=_YAML_DUMPER)
+
     agent = Agent(config_path)
     assert isinstance(agent.config, Config)
+    assert agent.config.repo_path == tmp_path
     assert agent.logger is not None
     assert agent.components is not None
+    mock_is_git_repo.assert_called_once_with(tmp_path)
@@ -1,19 +1,20 @@
+import os
 import pytest
+from types import SimpleNamespace
 from flask import url_for
 import json
-import sys
-from pathlib import Path
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+# Encoded once; the analyzer must reject a code field this large
+_LARGE_PAYLOAD = json.dumps({
+    'code': 'x' * 1_000_000,
+    'question': 'What does this do?'
+})
 
-@pytest.fixture
-def app(setup_test_config):
-    # Import app only after config is set up
-    from base_app import create_base_app
-    from blueprints.analyzer import analyzer
-    
-    app = create_base_app()
+
+@pytest.fixture(scope="session")
+def app(flask_app_parts):
+    # Built once per session; tests only create their own clients
+    app = flask_app_parts.create_base_app()
     app.config['TESTING'] = True
     app.config['SERVER_NAME'] = 'localhost'
     app.config['WTF_CSRF_ENABLED'] = False
@@ -26,11 +27,12 @@ def app(setup_test_config):
         'default': ['rm -rf', 'sudo', 'chmod'],
         'python': ['os.system', 'subprocess']
     }
-    app.register_blueprint(analyzer)
+    app.register_blueprint(flask_app_parts.analyzer)
     return app
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(app):
+    # Shared by the module; these tests keep no per-client state
     with app.test_client() as client:
         with app.app_context():
             yield client
@@ -53,10 +55,8 @@ def test_analyze_endpoint(client, app):
     print(f"Response status: {response.status_code}")
     print(f"Response data: {response.data.decode()}")
     assert response.status_code == 200
-    data = json.loads(response.data)
-    assert 'response' in data
-    data = json.loads(response.data)
-    assert 'response' in data
+    payload = response.get_json()
+    assert 'response' in payload
 
 @pytest.mark.timeout(30)  # Set 30 second timeout
 def test_invalid_input(client):
@@ -86,14 +86,10 @@ def test_invalid_input(client):
 
 @pytest.mark.timeout(30)  # Set 30 second timeout
 def test_large_input_validation(client):
-    test_data = {
-        'code': 'x' * 1000000,  # Very large code input
-        'question': 'What does this do?'
-    }
     with client.application.test_request_context():
         url = url_for('analyzer.analyze')
     response = client.post(url,
-                         data=json.dumps(test_data),
+                         data=_LARGE_PAYLOAD,
                          content_type='application/json')
     assert response.status_code == 400  # Expect a 400 Bad Request response
 
@@ -113,3 +109,34 @@ def test_result_template_rendering(client):
     # Test that we can access the "Back to Home" link
     back_to_home_response = client.get('/analyze')
     assert back_to_home_response.status_code == 200
+
+@pytest.fixture
+def agent_app(flask_app_parts, setup_test_config, tmp_path, monkeypatch):
+    """A private app whose Agent is a stand-in, built from its own copy of the config"""
+    config_path = tmp_path / "config_local.yaml"
+    config_path.write_text(setup_test_config.read_text())
+    monkeypatch.setattr('blueprints.analyzer.get_config_path', lambda: str(config_path))
+    built = []
+    monkeypatch.setattr('blueprints.analyzer.Agent', lambda config: built.append(config) or object())
+    app = flask_app_parts.create_base_app()
+    app.register_blueprint(flask_app_parts.analyzer)
+    return SimpleNamespace(app=app, config_path=config_path, built=built)
+
+def test_get_agent_reused_across_requests(agent_app):
+    from blueprints.analyzer import get_agent
+    with agent_app.app.test_request_context():
+        first = get_agent()
+    with agent_app.app.test_request_context():
+        second = get_agent()
+    assert first is second
+    assert len(agent_app.built) == 1
+
+def test_get_agent_rebuilt_when_config_changes(agent_app):
+    from blueprints.analyzer import get_agent
+    with agent_app.app.test_request_context():
+        first = get_agent()
+        mtime = os.stat(agent_app.config_path).st_mtime
+        os.utime(agent_app.config_path, (mtime + 10, mtime + 10))
+        second = get_agent()
+    assert first is not second
+    assert len(agent_app.built) == 2
@@ -1,14 +1,12 @@
 import pytest
 import tempfile
-import sys
 from pathlib import Path
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
 from config import Config
 import yaml
 
-@pytest.fixture
-def valid_config_file():
+@pytest.fixture(scope="session")
+def valid_config_file(tmp_path_factory):
+    # Written once; tests only read it
     config_data = {
         'REPO_PATH': '.',
         'VENV_PATH': 'venv',
@@ -45,9 +43,10 @@ def valid_config_file():
         }
     }
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
+    config_path = tmp_path_factory.mktemp("config") / "valid_config.yml"
+    with open(config_path, 'w') as f:
         yaml.dump(config_data, f)
-        return Path(f.name)
+    return config_path
 
 def test_config_validation(valid_config_file):
     config = Config(valid_config_file)
@@ -56,6 +55,17 @@ def test_config_validation(valid_config_file):
     assert config.aider_model == 'test-model'
     assert config.log_dir == 'logs'
 
+def test_config_from_dict(valid_config_file):
+    with open(valid_config_file) as f:
+        config_data = yaml.safe_load(f)
+
+    config = Config.from_dict(config_data)
+    assert vars(config) == vars(Config(valid_config_file))
+    assert 'AIDER_API_KEY' not in config_data  # the caller's dict is left alone
+
+    with pytest.raises(ValueError, match="Missing required configuration"):
+        Config.from_dict({})
+
 def test_config_invalid_yaml():
     with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
         f.write("invalid: yaml: :")
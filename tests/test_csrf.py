@@ -1,25 +1,33 @@
 import pytest
+import re
 from flask import url_for
 import json
 
-@pytest.fixture
-def app(setup_test_config):
-    from base_app import create_base_app
-    from blueprints.analyzer import analyzer
-    
-    app = create_base_app()
+_CSRF_TOKEN_RE = re.compile(r'name="csrf_token" value="(.+?)"')
+
+@pytest.fixture(scope="session")
+def app(flask_app_parts):
+    # Built once per session; the module shares one client below
+    app = flask_app_parts.create_base_app()
     app.config['TESTING'] = True
     app.config['SERVER_NAME'] = 'localhost'
     # Enable CSRF for testing
     app.config['WTF_CSRF_ENABLED'] = True
     # Register the analyzer blueprint
-    app.register_blueprint(analyzer)
+    app.register_blueprint(flask_app_parts.analyzer)
     return app
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(app):
+    # Shared so the token below stays valid for the session cookie it came with
     return app.test_client()
 
+@pytest.fixture(scope="module")
+def csrf_token(client):
+    """Fetch the form once and pull out its CSRF token."""
+    response = client.get('/analyze')
+    return _CSRF_TOKEN_RE.search(response.data.decode()).group(1)
+
 def test_csrf_token_present(client):
     """Test that CSRF token is present in the form."""
     response = client.get('/analyze')
@@ -46,17 +54,8 @@ def test_csrf_protection_json(client):
     assert response.status_code == 400
     assert b'CSRF token validation failed' in response.data
 
-def test_csrf_token_validation(client):
+def test_csrf_token_validation(client, csrf_token):
     """Test that requests with valid CSRF token are accepted."""
-    # First get a valid CSRF token
-    response = client.get('/analyze')
-    html = response.data.decode()
-    
-    # Extract CSRF token from the form
-    import re
-    csrf_token = re.search('name="csrf_token" value="(.+?)"', html).group(1)
-    
-    # Make request with valid token
     response = client.post('/analyze', data={
         'csrf_token': csrf_token,
         'code': 'print("hello")',
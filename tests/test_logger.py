@@ -3,43 +3,74 @@ import pytest
 import logging
 import logging.handlers
 import time
-import sys
-from pathlib import Path
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
+from concurrent.futures import ThreadPoolExecutor
 from logger import Logger
 
+@pytest.fixture
+def file_logger():
+    """Build Loggers with a file handler and detach only their handlers afterwards"""
+    loggers = []
+
+    def make(log_dir, **kwargs):
+        logger = Logger(log_dir=log_dir, **kwargs)
+        loggers.append(logger)
+        return logger
+
+    yield make
+    for logger in loggers:
+        logger.close()
+
 def test_logger_initialization():
     logger = Logger()
     assert logger.logger.level == logging.INFO
-    assert any(isinstance(h, logging.StreamHandler) for h in logger.logger.handlers)
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in logger.logger.handlers)
+    assert any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
+
+def test_logger_deferred_formatting(caplog):
+    logger = Logger()
+    with caplog.at_level(logging.INFO, logger=logger.logger.name):
+        logger.info("value: %s", 42)
+        logger.error("failed: %s", "boom")
+    assert "value: 42" in caplog.messages
+    assert "failed: boom" in caplog.messages
 
-def test_logger_with_file_handler():
-    test_log_dir = "test_logs"
-    logger = Logger(log_dir=test_log_dir, max_bytes=100)
-    assert Path(test_log_dir).exists()
+def test_logger_with_file_handler(tmp_path, file_logger):
+    test_log_dir = tmp_path / "logs"
+    logger = file_logger(test_log_dir, max_bytes=100)
+    assert test_log_dir.exists()
     assert any(isinstance(h, logging.handlers.RotatingFileHandler) 
-              for h in logger.logger.handlers)
-    assert len(logger.logger.handlers) == 2  # Stream handler and file handler
+              for h in logger.handlers)
+    assert len(logger.handlers) == 2  # Stream handler and file handler
+
+def test_logger_close_detaches_only_its_file_handler(tmp_path, file_logger):
+    kept = file_logger(tmp_path / "kept")
+    closed = Logger(log_dir=tmp_path / "closed")
+    closed.close()
+    file_handlers = [h for h in kept.handlers
+                     if isinstance(h, logging.handlers.RotatingFileHandler)]
+    assert [h.baseFilename for h in file_handlers] == [str(tmp_path / "kept" / "app.log")]
+    assert Logger._listener is not None
 
-def test_log_rotation():
-    test_log_dir = "test_logs"
+def test_log_rotation(tmp_path, file_logger):
+    test_log_dir = tmp_path
     max_bytes = 100
-    logger = Logger(log_dir=test_log_dir, max_bytes=max_bytes)
+    logger = file_logger(test_log_dir, max_bytes=max_bytes)
     
     # Write enough logs to trigger rotation
     for i in range(20):
         logger.info("x" * 10)
+    # Wait for the listener to write every record
+    Logger.flush()
     
-    log_files = list(Path(test_log_dir).glob("*.log*"))
+    log_files = list(test_log_dir.glob("*.log*"))
     assert len(log_files) > 1
 
-def test_log_cleanup():
-    test_log_dir = "test_logs"
-    logger = Logger(log_dir=test_log_dir)
+def test_log_cleanup(tmp_path, file_logger):
+    test_log_dir = tmp_path
+    logger = file_logger(test_log_dir)
 
     # Create some test log files with old timestamps
-    log_path = Path(test_log_dir)
+    log_path = test_log_dir
     test_files = ["test1.log", "test2.log"]
     for file in test_files:
         file_path = log_path / file
@@ -56,9 +87,20 @@ def test_log_cleanup():
     remaining_files = list(log_path.glob("*.log*"))
     assert len(remaining_files) == 0
 
-@pytest.fixture(autouse=True)
-def cleanup():
-    yield
-    import shutil
-    if Path("test_logs").exists():
-        shutil.rmtree("test_logs")
+def test_logger_setup_runs_once():
+    first = Logger()
+    listener = Logger._listener
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: Logger(), range(16)))
+    assert Logger._listener is listener
+    queue_handlers = [h for h in first.logger.handlers
+                      if isinstance(h, logging.handlers.QueueHandler)]
+    assert queue_handlers == [Logger._queue_handler]
+
+def test_logger_shutdown_detaches_queue_handler():
+    logger = Logger()
+    Logger.shutdown()
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.logger.handlers)
+    # The next Logger sets the queue up again
+    Logger()
+    assert Logger._listener is not None
@@ -0,0 +1,120 @@
+import gc
+import os
+import time
+import weakref
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+import resource_manager
+from resource_manager import (
+    ResourceManager, PARALLEL_UNLINK_THRESHOLD, RATE_LIMIT_WINDOW_SECONDS, TEMP_FILE_MAX_AGE_SECONDS
+)
+
+
+@pytest.fixture
+def make_manager(fake_config_factory):
+    """Build ResourceManagers and unregister them from the scheduler afterwards"""
+    managers = []
+
+    def make(**config):
+        manager = ResourceManager(fake_config_factory(**config))
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.stop_monitoring()
+
+def test_scheduler_started_once(make_manager):
+    managers = [make_manager() for _ in range(3)]
+    managers[0].start_monitoring()
+    scheduler = ResourceManager._scheduler
+    for manager in managers[1:]:
+        manager.start_monitoring()
+
+    assert scheduler is not None and scheduler.is_alive()
+    assert ResourceManager._scheduler is scheduler
+    assert all(manager in ResourceManager._registry for manager in managers)
+
+def test_collected_manager_leaves_registry(fake_config_factory):
+    manager = ResourceManager(fake_config_factory())
+    manager.start_monitoring()
+    registered = len(ResourceManager._registry)
+    ref = weakref.ref(manager)
+    del manager
+
+    # The scheduler may hold the manager for the length of one tick
+    deadline = time.monotonic() + 5
+    while ref() is not None and time.monotonic() < deadline:
+        gc.collect()
+        time.sleep(0.01)
+    assert ref() is None
+    assert len(ResourceManager._registry) == registered - 1
+
+def test_stop_monitoring_unregisters(make_manager):
+    manager = make_manager()
+    manager.start_monitoring()
+    assert manager in ResourceManager._registry
+
+    manager.stop_monitoring()
+    assert manager not in ResourceManager._registry
+    assert not manager.monitoring
+
+def _expired_temp_files(tmp_path, count):
+    """Create count files whose mtime is past TEMP_FILE_MAX_AGE_SECONDS"""
+    old = time.time() - TEMP_FILE_MAX_AGE_SECONDS - 60
+    files = []
+    for i in range(count):
+        temp_file = tmp_path / f"temp_{i}.txt"
+        temp_file.write_text("x")
+        os.utime(temp_file, (old, old))
+        files.append(temp_file)
+    return files
+
+def test_cleanup_removes_many_expired_files(make_manager, tmp_path):
+    manager = make_manager()
+    files = _expired_temp_files(tmp_path, PARALLEL_UNLINK_THRESHOLD + 8)
+    for temp_file in files:
+        manager.register_temp_file(temp_file)
+
+    manager.cleanup_resources()
+
+    assert not any(temp_file.exists() for temp_file in files)
+    assert manager.temp_files == set()
+
+def test_cleanup_keeps_file_that_failed_to_unlink(make_manager, tmp_path, monkeypatch, caplog):
+    manager = make_manager()
+    files = _expired_temp_files(tmp_path, 5)
+    for temp_file in files:
+        manager.register_temp_file(temp_file)
+    stuck = files[2]
+    real_unlink = Path.unlink
+
+    def unlink(self, missing_ok=False):
+        if self == stuck:
+            raise PermissionError("denied")
+        real_unlink(self, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", unlink)
+    with caplog.at_level("ERROR", logger="resource_manager"):
+        manager.cleanup_resources()
+
+    assert [temp_file for temp_file in files if temp_file.exists()] == [stuck]
+    assert manager.temp_files == {stuck}
+    assert f"Error cleaning up temp file {stuck}" in caplog.text
+
+def test_rate_limit_window(make_manager, monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    # Swap only the module's view of time, so other threads keep the real clock
+    monkeypatch.setattr(resource_manager, "time", SimpleNamespace(
+        monotonic=lambda: clock.now, time=time.time, sleep=time.sleep
+    ))
+    manager = make_manager(api_rate_limit=2)
+
+    assert manager.check_rate_limit()
+    assert manager.check_rate_limit()
+    clock.now += RATE_LIMIT_WINDOW_SECONDS - 1
+    assert not manager.check_rate_limit()
+
+    clock.now += 1
+    assert manager.check_rate_limit()
@@ -1,16 +1,23 @@
+import json
 import pytest
-import sys
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-# Add the directory containing agent_v2.py to the PYTHONPATH
-sys.path.append(str(Path(__file__).resolve().parent.parent))
 from suggestion_db import SuggestionDB
 
-@pytest.fixture
-def db():
-    """Create a fresh in-memory database for each test."""
+@pytest.fixture(scope="session")
+def db_engine():
+    """Build the in-memory database and its schema once."""
     return SuggestionDB()
 
+@pytest.fixture
+def db(db_engine):
+    """Hand each test the shared database, emptied again afterwards."""
+    yield db_engine
+    # add_suggestions opens its own transaction, so tests can't run inside
+    # a SAVEPOINT; clear the rows instead
+    db_engine._get_connection().execute("DELETE FROM suggestions")
+
 def test_table_creation(db):
     """Test that the suggestions table is created correctly."""
     # Add a suggestion to verify table exists and has correct schema
@@ -46,6 +53,30 @@ def test_add_and_get_suggestion(db):
     assert suggestion['response'] == {"response": "It does something"}
     assert suggestion['model'] == "test-model"
 
+def test_add_suggestion_returns_row(db):
+    """Test that add_suggestion returns the inserted row."""
+    added = db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+
+    assert added == db.get_suggestion(added['id'])
+
+def test_add_suggestions_batch(db):
+    """Test inserting several suggestions in one transaction."""
+    added = db.add_suggestions([
+        ("test1.py", "q1", {"response": "a1"}, "test-model"),
+        ("test2.py", "q2", {"response": "a2"}, "test-model"),
+    ])
+
+    assert added == 2
+    assert db.add_suggestions([]) == 0
+    suggestions = db.get_suggestions("test2.py")
+    assert len(suggestions) == 1
+    assert suggestions[0]['response'] == {"response": "a2"}
+
 def test_get_suggestion_by_id(db):
     """Test retrieving a specific suggestion by ID."""
     db.add_suggestion(
@@ -93,8 +124,9 @@ def test_delete_suggestion(db):
     suggestions = db.get_suggestions()
     suggestion_id = suggestions[0]['id']
     
-    db.delete_suggestion(suggestion_id)
+    assert db.delete_suggestion(suggestion_id) is True
     assert db.get_suggestion(suggestion_id) is None
+    assert db.delete_suggestion(suggestion_id) is False
     assert len(db.get_suggestions()) == 0
 
 def test_get_suggestions_filtering(db):
@@ -116,6 +148,119 @@ def test_get_suggestions_filtering(db):
     assert len(suggestions) == 1
     assert suggestions[0]['file'] == "test1.py"
 
+def test_get_suggestions_pagination(db):
+    """Test paging through suggestions with limit and offset."""
+    for i in range(5):
+        db.add_suggestion(
+            file="test.py",
+            question=f"q{i}",
+            response={"response": f"a{i}"},
+            model="test-model"
+        )
+
+    first_page = db.get_suggestions(limit=2)
+    second_page = db.get_suggestions(limit=2, offset=2)
+    assert [s['question'] for s in first_page] == ["q4", "q3"]
+    assert [s['question'] for s in second_page] == ["q2", "q1"]
+    assert len(db.get_suggestions("test.py", limit=10, offset=4)) == 1
+
+def test_response_stored_as_blob(db):
+    """Test that responses are stored as encoded bytes, not TEXT."""
+    added = db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+
+    row = db._get_connection().execute(
+        "SELECT typeof(response) AS kind FROM suggestions WHERE id = ?", (added['id'],)
+    ).fetchone()
+    assert row['kind'] == "blob"
+
+def test_file_filter_uses_index(db):
+    """Test that filtering by file is answered from the file/timestamp index."""
+    plan = db._get_connection().execute(
+        "EXPLAIN QUERY PLAN " + db.SELECT_BY_FILE_SQL, ("test.py", -1, 0)
+    ).fetchall()
+    details = " ".join(row['detail'] for row in plan)
+    assert "idx_file_ts" in details
+    assert "TEMP B-TREE" not in details
+
+def test_iter_suggestions_is_lazy(db):
+    """Test that iter_suggestions yields rows one at a time."""
+    for i in range(3):
+        db.add_suggestion(
+            file="test.py",
+            question=f"q{i}",
+            response={"response": f"a{i}"},
+            model="test-model"
+        )
+
+    rows = db.iter_suggestions(limit=None)
+    assert next(rows)['question'] == "q2"
+    assert [s['question'] for s in rows] == ["q1", "q0"]
+
+def test_get_suggestion_summaries(db):
+    """Test that summaries carry everything but the response."""
+    added = db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+
+    summaries = db.get_suggestion_summaries("test.py")
+    assert summaries == [{k: v for k, v in added.items() if k != 'response'}]
+    assert db.get_suggestion_summaries("other.py") == []
+
+def test_response_decoded_lazily(db, monkeypatch):
+    """Test that a row's response is only parsed when it is read."""
+    import suggestion_db
+    db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+    calls = []
+    real_loads = suggestion_db._loads
+    monkeypatch.setattr(suggestion_db, '_loads', lambda raw: calls.append(raw) or real_loads(raw))
+
+    suggestion = db.get_suggestions()[0]
+    assert suggestion['file'] == "test.py"
+    assert calls == []
+    assert suggestion['response'] == {"response": "answer"}
+    assert suggestion['response'] == {"response": "answer"}
+    assert len(calls) == 1
+
+def test_plain_text_response_not_parsed(db):
+    """Test that a non-JSON response is returned as text instead of failing to parse."""
+    added = db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+    db._get_connection().execute(
+        "UPDATE suggestions SET response = ? WHERE id = ?", (b"plain answer", added['id'])
+    )
+
+    assert db.get_suggestion(added['id'])['response'] == "plain answer"
+
+def test_suggestion_row_to_dict(db):
+    """Test that to_dict gives a plain, JSON-serializable dict."""
+    added = db.add_suggestion(
+        file="test.py",
+        question="question",
+        response={"response": "answer"},
+        model="test-model"
+    )
+
+    row = db.get_suggestion(added['id']).to_dict()
+    assert type(row) is dict
+    assert json.loads(json.dumps(row)) == added
+
 def test_json_serialization(db):
     """Test that JSON serialization/deserialization works correctly."""
     complex_response = {
@@ -136,25 +281,94 @@ def test_json_serialization(db):
     suggestion = db.get_suggestions()[0]
     assert suggestion['response'] == complex_response
 
-def test_file_based_db(tmp_path):
-    """Test that file-based database works correctly."""
-    db_path = tmp_path / "test_suggestions.db"
-    
-    # Use context manager for first connection with force_file=True
-    with SuggestionDB(str(db_path), force_file=True) as db1:
-        try:    
-            db1.add_suggestion(
+def test_shared_memory_db():
+    """Test that two SuggestionDBs on a shared-cache memory URI see the same data."""
+    db_path = "file:test_shared?mode=memory&cache=shared"
+
+    # The database lives only while a connection is open, so nest the two
+    with SuggestionDB(db_path) as db1:
+        db1.add_suggestion(
+            file="test.py",
+            question="question",
+            response={"response": "answer"},
+            model="test-model"
+        )
+
+        with SuggestionDB(db_path) as db2:
+            suggestions = db2.get_suggestions()
+            assert len(suggestions) == 1
+            assert suggestions[0]['file'] == "test.py"
+            assert db2._pool is None
+
+def test_migrates_iso_timestamps(tmp_path):
+    """Test that TEXT timestamps from older databases become nanosecond integers."""
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(SuggestionDB.CREATE_TABLE_SQL.replace("INTEGER NOT NULL", "DATETIME NOT NULL"))
+    conn.execute(
+        "INSERT INTO suggestions (file, question, response, model, timestamp) VALUES (?, ?, ?, ?, ?)",
+        ("test.py", "question", b'{"response":"answer"}', "test-model", "2024-01-02T03:04:05.678901")
+    )
+    conn.commit()
+    conn.close()
+
+    with SuggestionDB(str(db_path), force_file=True) as db:
+        suggestion = db.get_suggestions()[0]
+        expected = datetime.fromisoformat("2024-01-02T03:04:05.678901").timestamp()
+        assert suggestion['timestamp'] == round(expected * 1_000_000) * 1000
+        assert db._get_connection().execute('PRAGMA user_version').fetchone()[0] == db.SCHEMA_VERSION
+
+def test_file_based_db_reader_pool(tmp_path):
+    """Test that concurrent reads on a file database share a bounded reader pool."""
+    with SuggestionDB(str(tmp_path / "pool.db"), force_file=True) as db:
+        added = db.add_suggestion(
+            file="test.py",
+            question="question",
+            response={"response": "answer"},
+            model="test-model"
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(db.get_suggestion, [added['id']] * 32))
+        assert all(result == added for result in results)
+        assert db._pool._opened <= db.READER_POOL_SIZE
+
+        with db._pool.reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM suggestions")
+
+def test_reader_pool_times_out_when_exhausted(tmp_path):
+    """Test that a read fails instead of hanging while every reader is held."""
+    with SuggestionDB(str(tmp_path / "pool.db"), force_file=True) as db:
+        db.add_suggestion(
+            file="test.py",
+            question="question",
+            response={"response": "answer"},
+            model="test-model"
+        )
+        db._pool._n_readers = 1
+        db._pool._timeout = 0.01
+
+        with db._pool.reader():
+            with pytest.raises(sqlite3.OperationalError, match="No reader connection"):
+                db.get_suggestions()
+
+        assert len(db.get_suggestions()) == 1
+
+def test_iter_suggestions_releases_reader_early(tmp_path):
+    """Test that a partly consumed iter_suggestions() holds no pooled reader."""
+    with SuggestionDB(str(tmp_path / "pool.db"), force_file=True) as db:
+        for i in range(3):
+            db.add_suggestion(
                 file="test.py",
-                question="question",
-                response={"response": "answer"},
+                question=f"q{i}",
+                response={"response": f"a{i}"},
                 model="test-model"
             )
-        except Exception as e:
-            print(f"problem with db1: {e}")
-    
-    # Use context manager for second connection with force_file=True
-    with SuggestionDB(str(db_path), force_file=True) as db2:
-        suggestions = db2.get_suggestions()
-        print(f"suggestions: {suggestions}")
-        assert len(suggestions) == 1
-        assert suggestions[0]['file'] == "test.py"
+        db._pool._n_readers = 1
+        db._pool._timeout = 0.01
+
+        rows = db.iter_suggestions()
+        assert next(rows)['question'] == "q2"
+        assert len(db.get_suggestions()) == 3
+        assert [s['question'] for s in rows] == ["q1", "q0"]
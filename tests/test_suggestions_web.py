@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.fixture
+def app(flask_app_parts):
+    app = flask_app_parts.create_base_app()
+    app.config['TESTING'] = True
+    app.register_blueprint(flask_app_parts.analyzer)
+    # Each app opens its own in-memory SuggestionDB on registration
+    app.register_blueprint(flask_app_parts.suggestions)
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_list_suggestions_shows_every_row(app, client):
+    """Test that the list page is not cut off at the DB layer's default page size."""
+    app.extensions['suggestion_db'].add_suggestions(
+        (f"file{i}.py", f"question {i}", {"response": f"answer {i}"}, "test-model")
+        for i in range(150)
+    )
+
+    response = client.get('/suggestions')
+    assert response.status_code == 200
+    html = response.data.decode()
+    assert html.count('href="/suggestion/') == 150
+    assert 'file0.py' in html
+    assert 'file149.py' in html
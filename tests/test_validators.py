@@ -0,0 +1,95 @@
+import pytest
+from types import SimpleNamespace
+from validators import detect_language, sanitize_input, validate_code_safety, validate_input
+
+
+def make_config(max_line_length=100, dangerous_patterns=None):
+    """The config attributes validate_code_safety reads"""
+    return SimpleNamespace(
+        max_line_length=max_line_length,
+        dangerous_patterns=dangerous_patterns or {'default': []},
+    )
+
+@pytest.mark.parametrize("code, expected", [
+    ("sudo rm -rf /", "rm -rf"),
+    ("rm -rf / && sudo true", "rm -rf"),
+    ("SUDO chmod 777 x", "sudo"),
+])
+def test_dangerous_pattern_reported_in_config_order(code, expected):
+    config = make_config(dangerous_patterns={'default': ['rm -rf', 'sudo', 'chmod']})
+    assert validate_code_safety(code, config=config) == (
+        False, f"Potentially unsafe code pattern detected: {expected}"
+    )
+
+@pytest.mark.parametrize("text, expected", [
+    ("", ""),
+    ("print('hi')", "print('hi')"),
+    ("a\tb\nc", "a\tb\nc"),
+    ("a\r\nb", "a\nb"),
+    ("nul\x00byte", "nulbyte"),
+    ("\x01\x08\x0b\x0c\x1f", ""),
+    ("del\x7f", "del\x7f"),
+])
+def test_sanitize_input(text, expected):
+    assert sanitize_input(text) == expected
+
+def test_sanitize_input_returns_clean_text_unchanged():
+    text = "def test():\n\treturn 1"
+    assert sanitize_input(text) is text
+
+@pytest.mark.parametrize("code, expected", [
+    ("", None),
+    ("x = 1", None),
+    ("def foo(): pass", "python"),
+    ("puts x\nrequire 'y'", "ruby"),
+    # 'def ' scores for python and ruby alike; the earlier language wins
+    ("def foo\nend", "python"),
+    # 'function ' scores for javascript and php alike
+    ("function foo() {}", "javascript"),
+    # Both reach the highest bound left after python; the earlier one still wins
+    ("function const let var def require module puts", "javascript"),
+    ("import os\nclass A:\n    def f(self): print(1)\n# a.py", "python"),
+])
+def test_detect_language(code, expected):
+    assert detect_language(code) == expected
+
+@pytest.mark.parametrize("line_length, is_valid", [
+    (0, True),
+    (100, True),
+    (101, False),
+])
+def test_line_length_limit(line_length, is_valid):
+    code = "short\n" + "x" * line_length + "\nshort"
+    result = validate_code_safety(code, config=make_config(max_line_length=100))
+    expected_error = "" if is_valid else "Line exceeds maximum length of 100 characters"
+    assert result == (is_valid, expected_error)
+
+@pytest.mark.parametrize("code, is_valid", [
+    ("caf\u00e9 = '\u2603'", True),
+    ("x = '\ud800'", False),
+    ("x = '\udfff'", False),
+])
+def test_surrogates_rejected(code, is_valid):
+    expected_error = "" if is_valid else "Invalid character encoding detected"
+    assert validate_code_safety(code, config=make_config()) == (is_valid, expected_error)
+
+@pytest.mark.parametrize("code, language, expected", [
+    ("import os", "python", (True, "")),
+    ("os.system('ls')", "python", (False, "Potentially unsafe python code pattern detected: os.system")),
+    ("os.system('ls')", None, (True, "")),
+    ("os.system('ls')", "javascript", (True, "")),
+])
+def test_language_specific_patterns(code, language, expected):
+    config = make_config(dangerous_patterns={'default': ['sudo'], 'python': ['os.system']})
+    assert validate_code_safety(code, language, config) == expected
+
+@pytest.mark.parametrize("code, question, expected", [
+    ("", "q", (False, "Code cannot be empty")),
+    ("   \n\t", "q", (False, "Code cannot be empty")),
+    ("def f(:", "q", (False, "Mismatched parentheses in code")),
+    ("def f(): pass", "x" * 1001, (False, "Question exceeds maximum length of 1000 characters")),
+    ("def f(): pass", "What does this do?", (True, "")),
+    ("def f(): os.system('ls')", "q", (False, "Potentially unsafe python code pattern detected: os.system")),
+])
+def test_validate_input(code, question, expected):
+    assert validate_input(code, question) == expected
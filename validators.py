@@ -1,14 +1,82 @@
 """Input validation utilities for the application."""
+import os
+import re
+from functools import lru_cache
 from config import Config
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
+
+# Null bytes and control characters other than tab and newline, mapped for removal
+_CTRL_TABLE = {c: None for c in range(32) if c not in (9, 10)}
+_CTRL_RE = re.compile(r'[\x00-\x08\x0b-\x1f]')
+# JSON bodies can carry lone surrogates as \ud800-style escapes
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
+# Simple language detection based on common patterns, lowercased once at import
+_LANG_INDICATORS = tuple(
+    (language, tuple(pattern.lower() for pattern in patterns))
+    for language, patterns in {
+        'python': ['.py', 'def ', 'import ', 'class ', 'print('],
+        'javascript': ['function ', 'const ', 'let ', 'var ', 'console.log'],
+        'java': ['public class ', 'private ', 'protected ', 'System.out'],
+        'cpp': ['#include', 'using namespace', 'std::'],
+        'csharp': ['using System;', 'namespace ', 'public class'],
+        'go': ['package ', 'func ', 'import ('],
+        'rust': ['fn ', 'let mut ', 'use std'],
+        'typescript': ['interface ', 'type ', 'export class'],
+        'ruby': ['def ', 'require ', 'module ', 'puts '],
+        'php': ['<?php', 'function ', 'echo ', '$']
+    }.items()
+)
+# Highest score any language from each position onwards could still reach
+_LANG_SCORE_BOUNDS = tuple(
+    max(len(patterns) for _, patterns in _LANG_INDICATORS[i:])
+    for i in range(len(_LANG_INDICATORS))
+)
 
 def get_config_path():
     """Get the appropriate config file path based on environment."""
-    import os
     if os.environ.get('DOCKER_ENV'):
         return 'config_docker.yaml'
     return 'config_local.yaml'
 
+@lru_cache(maxsize=4)
+def _get_config(path: str, _mtime: Optional[float]) -> Config:
+    """Load the config at path; the _mtime key reloads it after the file changes."""
+    return Config(path)
+
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Compile literal patterns into one case-insensitive regex, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(map(re.escape, patterns)), re.IGNORECASE)
+
+@lru_cache(maxsize=8)
+def _long_line_regex(max_line_length: int) -> re.Pattern:
+    """Match any line longer than max_line_length, using str.splitlines() boundaries."""
+    return re.compile(r'[^\n\r\v\f\x1c-\x1e\x85\u2028\u2029]{%d,}' % (max_line_length + 1))
+
+def _find_pattern(patterns: Iterable[str], code: str) -> Optional[str]:
+    """Return the first configured pattern, in config order, found in code."""
+    patterns = tuple(patterns)
+    regex = _compile_patterns(patterns)
+    # One regex pass settles the common clean case; only a hit pays for the
+    # per-pattern scan that reports the same pattern the config lists first
+    match = regex.search(code) if regex else None
+    if match is None:
+        return None
+    code_lower = code.lower()
+    return next((pattern for pattern in patterns if pattern.lower() in code_lower), match.group(0))
+
+def _load_config() -> Config:
+    """Get the current configuration without re-reading an unchanged file."""
+    path = get_config_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+    return _get_config(path, mtime)
+
 def detect_language(code: str) -> Optional[str]:
     """
     Attempt to detect the programming language from the code.
@@ -19,32 +87,18 @@ def detect_language(code: str) -> Optional[str]:
     Returns:
         Optional[str]: Detected language or None if unable to determine
     """
-    # Simple language detection based on common patterns
-    indicators = {
-        'python': ['.py', 'def ', 'import ', 'class ', 'print('],
-        'javascript': ['function ', 'const ', 'let ', 'var ', 'console.log'],
-        'java': ['public class ', 'private ', 'protected ', 'System.out'],
-        'cpp': ['#include', 'using namespace', 'std::'],
-        'csharp': ['using System;', 'namespace ', 'public class'],
-        'go': ['package ', 'func ', 'import ('],
-        'rust': ['fn ', 'let mut ', 'use std'],
-        'typescript': ['interface ', 'type ', 'export class'],
-        'ruby': ['def ', 'require ', 'module ', 'puts '],
-        'php': ['<?php', 'function ', 'echo ', '$']
-    }
-    
     code_lower = code.lower()
-    matches = {}
-    
-    for lang, patterns in indicators.items():
-        matches[lang] = sum(1 for pattern in patterns if pattern.lower() in code_lower)
+    best_language, best_score = None, 0
     
-    if matches:
-        best_match = max(matches.items(), key=lambda x: x[1])
-        if best_match[1] > 0:
-            return best_match[0]
+    for (language, patterns), upper_bound in zip(_LANG_INDICATORS, _LANG_SCORE_BOUNDS):
+        # No language left can beat the current best; ties go to the earlier one
+        if best_score >= upper_bound:
+            break
+        score = sum(1 for pattern in patterns if pattern in code_lower)
+        if score > best_score:
+            best_language, best_score = language, score
     
-    return None
+    return best_language
 
 def validate_input(code: str, question: str, language: str = None) -> Tuple[bool, str]:
     """
@@ -57,7 +111,7 @@ def validate_input(code: str, question: str, language: str = None) -> Tuple[bool
     Returns:
         tuple[bool, str]: (is_valid, error_message)
     """
-    config = Config(get_config_path())
+    config = _load_config()
     
     if not code or not code.strip():
         return False, "Code cannot be empty"
@@ -100,43 +154,43 @@ def validate_input(code: str, question: str, language: str = None) -> Tuple[bool
     
     return True, ""
 
-def validate_code_safety(code: str, language: str, config: Config) -> Tuple[bool, str]:
+def validate_code_safety(code: str, language: Optional[str] = None,
+                         config: Optional[Config] = None) -> Tuple[bool, str]:
     """
     Validate code for potentially unsafe patterns.
     
     Args:
         code (str): The code to validate
+        language (Optional[str]): Language whose extra patterns also apply
+        config (Optional[Config]): Configuration to check against; the
+            current config file is used when omitted
         
     Returns:
         tuple[bool, str]: (is_valid, error_message)
     """
     try:
+        if config is None:
+            config = _load_config()
+
         # Check for reasonable line lengths
-        for line in code.splitlines():
-            if len(line) > config.max_line_length:
-                return False, f"Line exceeds maximum length of {config.max_line_length} characters"
+        if _long_line_regex(config.max_line_length).search(code):
+            return False, f"Line exceeds maximum length of {config.max_line_length} characters"
                 
-        # Check for valid encoding
-        try:
-            code.encode('utf-8')
-        except UnicodeEncodeError:
+        # Check for valid encoding; lone surrogates are the only str content
+        # that cannot be encoded as UTF-8
+        if _SURROGATE_RE.search(code):
             return False, "Invalid character encoding detected"
                 
-        # Check for dangerous patterns
-        code_lower = code.lower()
-            
         # Check default patterns for all languages
-        default_patterns = config.dangerous_patterns.get('default', [])
-        for pattern in default_patterns:
-            if pattern.lower() in code_lower:
-                return False, f"Potentially unsafe code pattern detected: {pattern}"
+        pattern = _find_pattern(config.dangerous_patterns.get('default', []), code)
+        if pattern is not None:
+            return False, f"Potentially unsafe code pattern detected: {pattern}"
             
         # Check language-specific patterns
         if language and language in config.dangerous_patterns:
-            lang_patterns = config.dangerous_patterns[language]
-            for pattern in lang_patterns:
-                if pattern.lower() in code_lower:
-                    return False, f"Potentially unsafe {language} code pattern detected: {pattern}"
+            pattern = _find_pattern(config.dangerous_patterns[language], code)
+            if pattern is not None:
+                return False, f"Potentially unsafe {language} code pattern detected: {pattern}"
                     
         return True, ""
         
@@ -153,10 +207,7 @@ def sanitize_input(text: str) -> str:
     Returns:
         str: Sanitized text
     """
-    # Remove null bytes
-    text = text.replace('\0', '')
-    
-    # Remove control characters except newlines and tabs
-    text = ''.join(char for char in text if char == '\n' or char == '\t' or not chr(0) <= char <= chr(31))
-    
-    return text
+    # Most input is clean; hand it back without building a copy
+    if not _CTRL_RE.search(text):
+        return text
+    return text.translate(_CTRL_TABLE)